@@ -1,15 +1,39 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-# SQLite database (no installation needed!)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./fairclaim.db"
+# SQLite database by default (no installation needed!); set DATABASE_URL for Postgres
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./fairclaim.db")
+
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    connect_args = {"check_same_thread": False}  # Needed for SQLite
+else:
+    connect_args = {"application_name": "fairclaim", "options": "-c statement_timeout=5000"}
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    connect_args=connect_args,
+    pool_size=int(os.getenv("DB_POOL_SIZE", 10)),  # Per process; size to concurrent requests + seeding
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 20)),
+    pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 30)),
+    pool_pre_ping=True,  # Replace stale connections instead of failing the request
+    pool_recycle=1800,
+    query_cache_size=1200,  # Compiled SQL cache (default 500)
+    insertmanyvalues_page_size=1000  # Rows per batched INSERT for executemany / bulk seeding
 )
 
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL + synchronous=NORMAL: no fsync per commit, readers don't block the writer"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
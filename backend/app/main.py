@@ -1,40 +1,35 @@
 from fastapi import FastAPI , Request , status
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base, SessionLocal
+from app.database import engine, Base
 from app.routers import cases, grievances
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from app.database import engine, Base, init_db
 from app.routers import verify
 import time
+import os
+import logging
+import asyncio
 
 from app.routers import auth, dashboard
-from app.utils.seed_data import seed_users, seed_cases, seed_grievances
-from app.models import Case, Grievance
-
-# Create database tables
-print("🔄 Creating database tables...")
-Base.metadata.create_all(bind=engine)
-print("✅ Database tables created successfully")
-
-# Seed database on startup
-print("\n📊 Initializing database with seed data...")
-try:
-    db = SessionLocal()
+from app.utils.seed_data import seed_all
+from app.services.priority_classifier import get_nlp_classifier
+from app.services import services
+
+# Application log level (services log auth/debug details at DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+# Create tables and reseed on import. In prod, run.py does this once before starting
+# the workers and sets FAIRCLAIM_DB_READY=1, so parallel workers don't all drop and
+# reseed the same tables. SEED_ON_STARTUP=0 skips the (destructive) reseed entirely.
+if os.getenv("FAIRCLAIM_DB_READY") != "1":
+    print("🔄 Creating database tables...")
+    Base.metadata.create_all(bind=engine)
+    print("✅ Database tables created successfully")
     
-    # Clean existing Cases and Grievances to prevent duplicates
-    print("🧹 Cleaning old Case and Grievance data...")
-    db.query(Grievance).delete()
-    db.query(Case).delete()
-    db.commit()
-    
-    seed_users(db)
-    seeded_cases = seed_cases(db)
-    seed_grievances(db, seeded_cases)
-    db.close()
-    print("✅ Database seeding completed successfully\n")
-except Exception as e:
-    print(f"⚠️  Database seeding encountered an issue: {e}\n")
+    if os.getenv("SEED_ON_STARTUP", "1") == "1":
+        # Wipe all cases/grievances (TRUNCATE / drop+recreate), then seed in one transaction
+        print("\n📊 Initializing database with seed data...")
+        seed_all(fresh=True)
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -72,6 +67,45 @@ async def add_process_time_header(request: Request, call_next):
     return response
 
 
+# ==================== STARTUP ====================
+
+@app.on_event("startup")
+def warm_nlp_classifier():
+    """Load the NLP classifier before traffic arrives so no request pays the cold start"""
+    classifier = get_nlp_classifier()
+    classifier.classify_priority("warmup", "warmup text long enough to be encoded", "")
+
+
+@app.on_event("startup")
+async def start_dashboard_stats_refresher():
+    """Rebuild the dashboard_stats snapshot table when it is due or has been invalidated"""
+    async def refresh_loop():
+        while True:
+            try:
+                await asyncio.to_thread(services.refresh_dashboard_stats_if_due)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.getLogger(__name__).exception("Dashboard stats refresh failed")
+            await asyncio.sleep(services.DASHBOARD_STATS_POLL_SECONDS)
+
+    # Keep a strong reference: the event loop only holds tasks weakly
+    app.state.dashboard_refresher = asyncio.create_task(refresh_loop())
+
+
+@app.on_event("shutdown")
+async def stop_dashboard_stats_refresher():
+    """Cancel the refresher and wait for it to unwind"""
+    task = getattr(app.state, "dashboard_refresher", None)
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
 # ==================== EXCEPTION HANDLERS ====================
 
 @app.exception_handler(RequestValidationError)
@@ -177,5 +211,6 @@ def health_check():
     return {
         "status": "healthy",
         "database": "SQLite (fairclaim.db)",
+        "db_pool": engine.pool.status(),
         "version": "1.0.0"
     }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Enum , Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Enum , Boolean, Index, text
 import enum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -37,6 +37,10 @@ class GrievancePriority(str, enum.Enum):
 # Case Model
 class Case(Base):
     __tablename__ = "cases"
+    __table_args__ = (
+        # Covers the dashboard status GROUP BY and the per-status compensation sums
+        Index("ix_cases_status_compensation", "status", "compensation_amount"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     case_number = Column(String(50), unique=True, nullable=False, index=True)
@@ -85,6 +89,15 @@ class Case(Base):
 # Grievance Model
 class Grievance(Base):
     __tablename__ = "grievances"
+    __table_args__ = (
+        # Dashboard grievance counters filter on status and on HIGH priority
+        Index("ix_grievances_status", "status"),
+        Index(
+            "ix_grievances_priority_high", "priority",
+            sqlite_where=text("priority = 'HIGH'"),
+            postgresql_where=text("priority = 'HIGH'")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     grievance_number = Column(String(50), unique=True, nullable=False, index=True)
@@ -169,4 +182,28 @@ class User(Base):
     created_grievances = relationship("Grievance", back_populates="creator")
     
     def __repr__(self):
-        return f"<User(id={self.id}, email='{self.email}', role='{self.role.value}')>"
\ No newline at end of file
+        return f"<User(id={self.id}, email='{self.email}', role='{self.role.value}')>"
+
+
+class DashboardStats(Base):
+    """
+    Single-row snapshot of the dashboard aggregates
+    Refreshed in the background so dashboard reads are one primary-key lookup
+    """
+    __tablename__ = "dashboard_stats"
+
+    id = Column(Integer, primary_key=True)  # Always 1
+
+    total_cases = Column(Integer, default=0, nullable=False)
+    status_breakdown = Column(Text, nullable=False, default="{}")  # JSON {status: count}
+    total_allocated = Column(Float, default=0.0, nullable=False)
+    total_disbursed = Column(Float, default=0.0, nullable=False)
+
+    grievances_total = Column(Integer, default=0, nullable=False)
+    grievances_pending = Column(Integer, default=0, nullable=False)
+    grievances_open = Column(Integer, default=0, nullable=False)
+    grievances_in_progress = Column(Integer, default=0, nullable=False)
+    grievances_resolved = Column(Integer, default=0, nullable=False)
+    grievances_high_priority = Column(Integer, default=0, nullable=False)
+
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -2,6 +2,7 @@
 Authentication Routes
 Handles user registration, login, and current user retrieval
 """
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -10,6 +11,8 @@ from app.schemas import UserCreate, UserLogin, Token, UserResponse
 from app.services import services
 from app.models import User
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 security = HTTPBearer()
 
@@ -136,18 +139,14 @@ def get_current_user_info(
 ):
     """Get current logged-in user information"""
     
-    # DEBUG: Log the raw token
     token = credentials.credentials
-    print(f"🔍 DEBUG: Received token: {token[:20]}..." if len(token) > 20 else f"🔍 DEBUG: Received token: {token}")
+    logger.debug("Received token: %s...", token[:20])
     
     # Verify and decode token
     payload = services.verify_token(token)
     
-    # DEBUG: Log payload result
-    print(f"🔍 DEBUG: Token payload: {payload}")
-    
     if not payload:
-        print("❌ DEBUG: Token verification failed - payload is None")
+        logger.debug("Token verification failed - payload is None")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token. Please login again.",
@@ -156,10 +155,10 @@ def get_current_user_info(
     
     # Extract user ID from token
     user_id = payload.get("sub")
-    print(f"🔍 DEBUG: Extracted user_id: {user_id}")
+    logger.debug("Extracted user_id: %s", user_id)
     
     if not user_id:
-        print("❌ DEBUG: No 'sub' field in token payload")
+        logger.debug("No 'sub' field in token payload")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
@@ -168,7 +167,7 @@ def get_current_user_info(
     
     # Get user from database
     user = services.get_user_by_id(db, int(user_id))
-    print(f"🔍 DEBUG: User found: {user.email if user else 'None'}")
+    logger.debug("User found: %s", user.email if user else None)
     
     if not user:
         raise HTTPException(
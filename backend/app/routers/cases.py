@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import json
@@ -10,11 +10,13 @@ from app.models import Case, User
 from app.schemas import (
     CaseCreate, 
     CaseUpdate, 
+    CaseBulkStatusUpdate,
     CaseResponse, 
     CaseListResponse, 
     VictimCaseCreate  # ✅ New schema for victim registration
 )
 from app.services import FileHandler, calculate_compensation
+from app.services.services import invalidate_dashboard_cache, send_case_status_notifications
 
 router = APIRouter(prefix="/cases", tags=["Cases"])
 file_handler = FileHandler()
@@ -106,6 +108,7 @@ def register_victim_case(
         
         db.add(db_case)
         db.commit()
+        invalidate_dashboard_cache()
         db.refresh(db_case)
         
         print(f"✅ Case {db_case.case_number} created with auto-compensation: ₹{compensation:,.2f}")
@@ -242,6 +245,7 @@ def update_case(
     
     try:
         db.commit()
+        invalidate_dashboard_cache()
         db.refresh(case)
         return case
     except Exception as e:
@@ -252,6 +256,57 @@ def update_case(
         )
 
 
+@router.post("/bulk-status", response_model=List[CaseResponse])
+def bulk_update_case_status(
+    update: CaseBulkStatusUpdate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Move several cases to one status and notify each victim by SMS (officials only)"""
+    user_role = get_user_role(current_user)
+    
+    if user_role not in ["admin", "official", "officer"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and officers can update cases"
+        )
+    
+    case_ids = set(update.case_ids)
+    cases = db.query(Case).filter(Case.id.in_(case_ids)).all()
+    missing = case_ids - {case.id for case in cases}
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Cases not found: {sorted(missing)}"
+        )
+    
+    for case in cases:
+        case.status = update.status.value
+        if update.remarks is not None:
+            case.remarks = update.remarks
+    
+    try:
+        db.commit()
+        invalidate_dashboard_cache()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update cases: {str(e)}"
+        )
+    
+    # Reload in one query rather than one refresh per expired row
+    cases = db.query(Case).filter(Case.id.in_(case_ids)).all()
+    
+    # The SMS go out concurrently after the response is sent
+    background_tasks.add_task(
+        send_case_status_notifications,
+        [(case.victim_phone, case.id, case.status, case.victim_name) for case in cases]
+    )
+    return cases
+
+
 # ============= DOCUMENT UPLOAD =============
 
 @router.post("/{case_id}/upload", response_model=CaseResponse)
@@ -332,6 +387,7 @@ def delete_case(
     try:
         db.delete(case)
         db.commit()
+        invalidate_dashboard_cache()
     except Exception as e:
         db.rollback()
         raise HTTPException(
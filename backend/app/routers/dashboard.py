@@ -4,7 +4,7 @@ Provides aggregated statistics for admin/official dashboards and personalized vi
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case as sql_case
 from app.database import get_db
 from app.schemas import DashboardStats
 from app.services import services
@@ -97,25 +97,27 @@ def get_victim_stats(user: User, db: Session):
     }
 
 def get_official_stats(user: User, db: Session):
-    # Aggregated System Stats
-    total_cases = db.query(Case).filter(Case.assigned_officer == user.full_name).count()
-    
-    # Fund Stats
-    total_disbursed = db.query(func.sum(Case.compensation_amount)).filter(
-            Case.status == "COMPLETED"
-        ).scalar() or 0.0
-    total_allocated = db.query(func.sum(Case.compensation_amount)).scalar() or 0
-    
-    # Action Items
-    pending_verifications = db.query(Case).filter(
-        (Case.status == "PENDING") | (Case.status == "UNDER_REVIEW")
-    ).count()
-    escalated_grievances = db.query(Grievance).filter(Grievance.is_escalated == True).count()
+    # Every case counter and fund sum via conditional aggregation (single scan)
+    c = db.query(
+        func.count(sql_case((Case.assigned_officer == user.full_name, 1))).label("total_cases"),
+        func.sum(sql_case((Case.status == "COMPLETED", Case.compensation_amount))).label("total_disbursed"),
+        func.sum(Case.compensation_amount).label("total_allocated"),
+        func.count(sql_case((Case.status.in_(["PENDING", "UNDER_REVIEW"]), 1))).label("pending_verifications"),
+        func.count(sql_case((Case.stage == "FIR", 1))).label("fir"),
+        func.count(sql_case((Case.stage == "CHARGESHEET", 1))).label("chargesheet"),
+        func.count(sql_case((Case.stage == "CONVICTION", 1))).label("conviction"),
+    ).one()
+
+    total_cases = c.total_cases
+    total_disbursed = c.total_disbursed or 0.0
+    total_allocated = c.total_allocated or 0
+    pending_verifications = c.pending_verifications
+    escalated_grievances = db.query(func.count(Grievance.id)).filter(Grievance.is_escalated == True).scalar()
 
     status_breakdown = {
-        "FIR_Stage": db.query(Case).filter(Case.stage == "FIR").count(),
-        "Chargesheet_Stage": db.query(Case).filter(Case.stage == "CHARGESHEET").count(),
-        "Conviction_Stage": db.query(Case).filter(Case.stage == "CONVICTION").count(),
+        "FIR_Stage": c.fir,
+        "Chargesheet_Stage": c.chargesheet,
+        "Conviction_Stage": c.conviction,
     }
 
     return {
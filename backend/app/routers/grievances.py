@@ -7,6 +7,7 @@ from app.database import get_db
 from app.models import Grievance, Case , User
 from app.schemas import GrievanceCreate, GrievanceUpdate, GrievanceResponse, GrievanceListResponse
 from app.services.priority_classifier import get_nlp_classifier
+from app.services.services import invalidate_dashboard_cache
 
 router = APIRouter(prefix="/grievances", tags=["Grievances"])
 
@@ -69,6 +70,7 @@ def create_grievance(grievance: GrievanceCreate, db: Session = Depends(get_db),c
         
         db.add(db_grievance)
         db.commit()
+        invalidate_dashboard_cache()
         db.refresh(db_grievance)
         
         # Add classification metadata to response
@@ -234,6 +236,7 @@ def update_grievance(
     
     try:
         db.commit()
+        invalidate_dashboard_cache()
         db.refresh(grievance)
         return grievance
     except Exception as e:
@@ -261,6 +264,7 @@ def delete_grievance(grievance_id: int, db: Session = Depends(get_db),current_us
     try:
         db.delete(grievance)
         db.commit()
+        invalidate_dashboard_cache()
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -5,11 +5,17 @@ from app.services import services
 from app.routers.auth import get_current_user
 from app.models import User
 import os
+import secrets
 import uuid
 from datetime import datetime
+from typing import List
 
 router = APIRouter()
 
+# Upper bounds for one /verify-documents request
+MAX_BATCH_FILES = 10
+MAX_BATCH_TOTAL_BYTES = 50 * 1024 * 1024  # 50 MB
+
 @router.post("/verify-document")
 async def verify_document(
     file: UploadFile = File(..., description="Document image (JPG/PNG)"),
@@ -61,10 +67,11 @@ async def verify_document(
             f.write(content)
         
         # Verify document with enhanced agent
-        verification_result = services.verify_document_with_ocr(
+        verification_result = await services.verify_document_with_ocr_async(
             file_path=file_path,
             document_type=document_type,
-            user=current_user  # Pass user object for cross-verification
+            user=current_user,  # Pass user object for cross-verification
+            file_bytes=content  # Already in memory; skip reading it back from disk
         )
         
         # Security Check: Log suspicious activity
@@ -100,6 +107,95 @@ async def verify_document(
         )
 
 
+@router.post("/verify-documents")
+async def verify_documents(
+    files: List[UploadFile] = File(..., description="Document images (JPG/PNG) of the same type"),
+    document_type: str = Form(..., description="aadhaar, caste_certificate, income_certificate, fir_copy"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Verify several documents of one type in a single request
+
+    FIR copies are OCR'd by one batched Tesseract run instead of one process per file.
+    """
+    allowed_extensions = ['.jpg', '.jpeg', '.png', '.pdf']
+
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files. Maximum per request: {MAX_BATCH_FILES}"
+        )
+
+    if document_type == "aadhaar" and not current_user.aadhaar_number:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Please update your Aadhaar number in profile before verification"
+        )
+
+    # Validate every file before writing any of them
+    uploads = []
+    total_size = 0
+    for file in files:
+        file_ext = os.path.splitext(file.filename)[1].lower()
+        if file_ext not in allowed_extensions:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file type for {file.filename}. Allowed: {', '.join(allowed_extensions)}"
+            )
+        content = await file.read()
+        if len(content) > 10 * 1024 * 1024:  # 10 MB
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File too large: {file.filename}. Maximum size: 10 MB"
+            )
+        total_size += len(content)
+        if total_size > MAX_BATCH_TOTAL_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Upload too large. Maximum total size: {MAX_BATCH_TOTAL_BYTES // (1024 * 1024)} MB"
+            )
+        uploads.append((file.filename, file_ext, content))
+
+    file_paths = []
+    try:
+        os.makedirs("uploads", exist_ok=True)
+        for _, file_ext, content in uploads:
+            file_path = os.path.join("uploads", f"{secrets.token_hex(16)}{file_ext}")
+            with open(file_path, "wb") as f:
+                f.write(content)
+            file_paths.append(file_path)
+
+        results = await services.verify_document_batch_async(file_paths, document_type, current_user)
+
+        return {
+            "success": True,
+            "document_type": document_type,
+            "results": [
+                {
+                    "filename": filename,
+                    "file_id": os.path.splitext(os.path.basename(file_path))[0],
+                    "verification_result": result
+                }
+                for (filename, _, _), file_path, result in zip(uploads, file_paths, results)
+            ],
+            "uploaded_by": current_user.email,
+            "user_name": current_user.full_name,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    except Exception as e:
+        # Cleanup on error
+        for file_path in file_paths:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Verification failed: {str(e)}"
+        )
+
+
 @router.get("/supported-documents")
 def get_supported_documents():
     """List supported document types and languages"""
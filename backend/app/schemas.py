@@ -99,6 +99,12 @@ class CaseUpdate(BaseModel):
     remarks: Optional[str] = None
 
 
+class CaseBulkStatusUpdate(BaseModel):
+    case_ids: List[int] = Field(..., min_length=1, max_length=100)
+    status: CaseStatus
+    remarks: Optional[str] = None
+
+
 # ✅ CASE RESPONSE - SERIALIZES PROPERLY
 class CaseResponse(CaseBase):
     id: int
@@ -1,42 +1,48 @@
 import os
-import uuid
+import secrets
+import shutil
 from pathlib import Path
 from typing import List
 from fastapi import UploadFile, HTTPException, status
 
+# Large buffer so big PDF uploads hit the disk in few syscalls
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
 class FileHandler:
     def __init__(self):
         self.upload_dir = Path("uploads")
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         self.allowed_extensions = {".pdf", ".jpg", ".jpeg", ".png", ".doc", ".docx"}
         
-    def validate_file(self, file: UploadFile) -> None:
-        """Validate file extension"""
+    def validate_file(self, file: UploadFile) -> str:
+        """Validate file extension and return it (lowercased)"""
         file_ext = Path(file.filename).suffix.lower()
         if file_ext not in self.allowed_extensions:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"File type {file_ext} not allowed. Allowed: {self.allowed_extensions}"
             )
+        return file_ext
     
     def save_file(self, file: UploadFile, subfolder: str = "cases") -> str:
         """Save uploaded file and return file path"""
-        self.validate_file(file)
-        
+        file_ext = self.validate_file(file)
+        return self._write_file(file, file_ext, subfolder)
+    
+    def _write_file(self, file: UploadFile, file_ext: str, subfolder: str) -> str:
+        """Write an already-validated upload to disk under a unique name"""
         # Create subfolder
         folder_path = self.upload_dir / subfolder
         folder_path.mkdir(parents=True, exist_ok=True)
         
         # Generate unique filename
-        file_ext = Path(file.filename).suffix
-        unique_filename = f"{uuid.uuid4()}{file_ext}"
+        unique_filename = f"{secrets.token_hex(16)}{file_ext}"
         file_path = folder_path / unique_filename
         
         # Save file
         try:
-            with open(file_path, "wb") as buffer:
-                content = file.file.read()
-                buffer.write(content)
+            with open(file_path, "wb", buffering=WRITE_BUFFER_SIZE) as buffer:
+                shutil.copyfileobj(file.file, buffer, length=WRITE_BUFFER_SIZE)
             return str(file_path)
         except Exception as e:
             raise HTTPException(
@@ -46,8 +52,11 @@ class FileHandler:
     
     def save_multiple_files(self, files: List[UploadFile], subfolder: str = "cases") -> List[str]:
         """Save multiple files"""
+        # Validate everything up front so a bad file doesn't leave a partial batch on disk
+        file_exts = [self.validate_file(file) for file in files]
+        
         file_paths = []
-        for file in files:
-            file_path = self.save_file(file, subfolder)
+        for file, file_ext in zip(files, file_exts):
+            file_path = self._write_file(file, file_ext, subfolder)
             file_paths.append(file_path)
         return file_paths
@@ -3,86 +3,526 @@ Business logic and service functions
 Enhanced with multi-language document verification agent + PDF QR Support
 """
 
-from passlib.context import CryptContext
-from jose import JWTError, jwt, ExpiredSignatureError
+import bcrypt
+import jwt  # PyJWT; HMAC-SHA256 goes through OpenSSL via cryptography
+from jwt import ExpiredSignatureError, InvalidTokenError as JWTError
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import User, UserRole, Case, Grievance, GrievanceStatus
-from typing import Optional, Dict, List
+from sqlalchemy import func, case, select, update
+from app.models import User, UserRole, Case, Grievance, GrievanceStatus, DashboardStats
+from app.database import SessionLocal
+from typing import Optional, Dict, List, Union
 import os
+import time
+import logging
 from dotenv import load_dotenv
-import pytesseract
 from PIL import Image
-from twilio.rest import Client
-import cv2
+import httpx
+import asyncio
 import numpy as np
 
 # NEW: PDF and QR handling imports
 import io
 import zlib
 import base64
-from pdf2image import convert_from_path
+
+
+import functools
+
+
+# Heavy OCR/imaging libraries load on first use, so workers that only serve
+# dashboard, case or auth endpoints never import them. The import lock makes
+# the first call thread-safe and functools.cache makes later calls a dict hit
+@functools.cache
+def _cv2():
+    import cv2
+    return cv2
+
+
+@functools.cache
+def _pytesseract():
+    import pytesseract
+    return pytesseract
+
+
+@functools.cache
+def _pdf2image():
+    import pdf2image
+    return pdf2image
+
+
+@functools.cache
+def _pdfium():
+    """pypdfium2, or None to fall back to pdf2image (Poppler subprocess)"""
+    try:
+        import pypdfium2
+    except ImportError:
+        return None
+    return pypdfium2
 
 try:
     import pyzbar.pyzbar as pyzbar
 except ImportError:
     pyzbar = None  # Handle if not installed
 
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None  # Falls back to the pytesseract subprocess
+
 import re
-from difflib import SequenceMatcher
-import xml.etree.ElementTree as ET
+from rapidfuzz import fuzz
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Falls back to per-keyword bytes search
+from lxml import etree
+import threading
+import hashlib
+import unicodedata
+import secrets
+import copy
+import sqlite3
+import queue
+import tempfile
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Keep Tesseract single-threaded; concurrency comes from handling requests in parallel
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
 # ==================== CONFIGURATION ====================
 
 # JWT Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")  # Encoded once instead of on every sign/verify
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 1440))
 
 # Twilio Configuration
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
 TWILIO_MESSAGING_SERVICE_SID = os.getenv("TWILIO_MESSAGING_SERVICE_SID")
+TWILIO_ENABLED = bool(TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN and TWILIO_MESSAGING_SERVICE_SID)
+TWILIO_MESSAGES_URL = "https://api.twilio.com/2010-04-01/Accounts/{sid}/Messages.json"
+
+# Refuse decompression-bomb uploads (~50 MP is well above any phone or scanner page)
+Image.MAX_IMAGE_PIXELS = 50_000_000
 
 # Tesseract Configuration (Windows users uncomment and set path)
 # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (bcrypt only looks at the first 72 bytes)
+BCRYPT_ROUNDS = 12
+BCRYPT_MAX_BYTES = 72
+
+# Precompiled Aadhaar patterns
+_AADHAAR_NUMBER_RE = re.compile(r'\b\d{4}\s*\d{4}\s*\d{4}\b')
+_AADHAAR_QR_FIELD_RES = {
+    "aadhaar_number": re.compile(r'uid="(\d{12})"', re.IGNORECASE),
+    "name": re.compile(r'name="([^"]+)"', re.IGNORECASE),
+    "dob": re.compile(r'dob="([^"]+)"', re.IGNORECASE),
+    "gender": re.compile(r'gender="([^"]+)"', re.IGNORECASE)
+}
+
+# Long-edge size QR detection tries first on large scans (QR codes are a few hundred px)
+QR_DOWNSCALE_MAX_EDGE = 1600
+
+# Certificate QR codes are large relative to the page, so zbar scans a copy this size first
+CERT_QR_MAX_EDGE = 1024
+
+# Shared pool for QR variant decoding (OpenCV and zbar release the GIL)
+_QR_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="qr")
+_qr_thread_local = threading.local()
+
+# WeChat CNN QR detector (opencv-contrib); the four Caffe model files
+# (detect/sr .prototxt + .caffemodel) are looked up in this directory
+WECHAT_QR_MODEL_DIR = os.getenv(
+    "WECHAT_QR_MODEL_DIR",
+    os.path.join(os.path.dirname(__file__), "wechat_qrcode")
+)
+WECHAT_QR_MODEL_FILES = ("detect.prototxt", "detect.caffemodel", "sr.prototxt", "sr.caffemodel")
 
 
 # ==================== PDF & QR HELPER FUNCTIONS ====================
 
-def render_pdf_to_image(pdf_path: str):
+# Aadhaar PDFs render at the lowest DPI first; higher rungs only if QR detection fails
+PDF_RENDER_DPI_LADDER = (300, 400, 500)
+PDF_RENDER_DPI = PDF_RENDER_DPI_LADDER[0]
+
+
+def render_pdf_to_image(pdf_source, dpi: int = PDF_RENDER_DPI):
     """
-    Enhanced PDF rendering with multiple DPI attempts
+    Render the first page of a PDF in-process with pypdfium2
     Handles both DigiLocker and myAadhaar PDFs
+    Accepts a file path or the PDF bytes
     """
-    for dpi in [600, 500, 400, 300]:  # Try higher DPI first for myAadhaar
+    pdfium = _pdfium()
+    if pdfium is None:
+        # Only rasterise page 1; Poppler otherwise decodes every page
+        if isinstance(pdf_source, (bytes, bytearray)):
+            pages = _pdf2image().convert_from_bytes(pdf_source, dpi=dpi, first_page=1, last_page=1)
+        else:
+            pages = _pdf2image().convert_from_path(pdf_source, dpi=dpi, first_page=1, last_page=1)
+        if not pages:
+            raise Exception("Failed to render PDF")
+        return pages[0]
+
+    pdf = pdfium.PdfDocument(pdf_source)
+    try:
+        page = pdf[0]
         try:
-            pages = convert_from_path(pdf_path, dpi=dpi)
-            if pages:
-                print(f"✅ Rendered PDF at {dpi} DPI")
-                return pages[0]
-        except Exception as e:
-            print(f"⚠️  DPI {dpi} failed: {e}")
-            continue
+            return page.render(scale=dpi / 72).to_pil()
+        finally:
+            page.close()
+    finally:
+        pdf.close()
+
+
+def _thread_qr_detector():
+    """cv2.QRCodeDetector is not thread-safe, so keep one per worker thread"""
+    detector = getattr(_qr_thread_local, "detector", None)
+    if detector is None:
+        detector = _qr_thread_local.detector = _cv2().QRCodeDetector()
+    return detector
+
+
+def _thread_wechat_qr_detector():
+    """
+    One WeChatQRCode detector per worker thread, or None without opencv-contrib
+
+    Without the model files the detector still works, just without the CNN
+    localisation and super-resolution stages.
+    """
+    detector = getattr(_qr_thread_local, "wechat", False)
+    if detector is False:
+        detector = None
+        if hasattr(_cv2(), "wechat_qrcode_WeChatQRCode"):
+            paths = [os.path.join(WECHAT_QR_MODEL_DIR, f) for f in WECHAT_QR_MODEL_FILES]
+            try:
+                if all(os.path.exists(path) for path in paths):
+                    detector = _cv2().wechat_qrcode_WeChatQRCode(*paths)
+                else:
+                    detector = _cv2().wechat_qrcode_WeChatQRCode()
+            except _cv2().error as e:
+                logger.warning("WeChat QR detector unavailable: %s", e)
+        _qr_thread_local.wechat = detector
+    return detector
+
+
+def decode_qr_wechat(image) -> Optional[str]:
+    """Single-pass QR decode with the WeChat detector (None if absent or nothing found)"""
+    detector = _thread_wechat_qr_detector()
+    if detector is None:
+        return None
+    results, _ = detector.detectAndDecode(image)
+    for data in results:
+        if len(data) > 50:
+            return data
+    return None
+
+
+def _thread_clahe(clip_limit: float):
+    """Reusable CLAHE per thread and clip limit (apply() keeps internal buffers)"""
+    clahes = getattr(_qr_thread_local, "clahes", None)
+    if clahes is None:
+        clahes = _qr_thread_local.clahes = {}
+    clahe = clahes.get(clip_limit)
+    if clahe is None:
+        clahe = clahes[clip_limit] = _cv2().createCLAHE(clipLimit=clip_limit, tileGridSize=(8, 8))
+    return clahe
+
+
+def _decode_qr_variant(build_variant) -> Optional[Union[str, bytes]]:
+    """
+    Build one preprocessed image and try OpenCV then pyzbar on it
+
+    pyzbar hits are returned as raw bytes: SQR-3 payloads are binary-safe
+    that way and short reads are rejected before any decoding.
+    """
+    img = build_variant()
+    data, _, _ = _thread_qr_detector().detectAndDecode(img)
+    if data and len(data) > 50:
+        return data
+
+    if pyzbar is not None:
+        for obj in pyzbar.decode(img):
+            if obj.type == 'QRCODE' and len(obj.data) > 50:
+                return obj.data
+
+    return None
+
+
+def _decode_qr_composite(planes) -> Optional[tuple]:
+    """
+    Stack same-size single-channel variants vertically and decode them in one
+    detectAndDecodeMulti (then one pyzbar) pass over the composite
+
+    Returns (data, index of the variant it was found in), or None.
+    """
+    composite = np.vstack(planes)
+    height = planes[0].shape[0]
+
+    ok, decoded, points, _ = _thread_qr_detector().detectAndDecodeMulti(composite)
+    if ok:
+        for data, pts in zip(decoded, points):
+            if data and len(data) > 50:
+                return data, int(pts[:, 1].min()) // height
+
+    if pyzbar is not None:
+        for obj in pyzbar.decode(composite):
+            if obj.type == 'QRCODE' and len(obj.data) > 50:
+                return obj.data, obj.rect.top // height
+
+    return None
+
+
+# QR preprocessing variants (name, build(image, gray)), each computed at most once
+# per resolution. The first QR_FAST_VARIANTS run for every image; the threshold
+# variants are only worth it for rendered PDFs.
+QR_VARIANTS = (
+    ("direct", lambda image, gray: image),
+    ("grayscale", lambda image, gray: gray),
+    ("clahe", lambda image, gray: _thread_clahe(3.0).apply(gray)),
+    ("adaptive_threshold", lambda image, gray: _cv2().adaptiveThreshold(
+        gray, 255, _cv2().ADAPTIVE_THRESH_MEAN_C, _cv2().THRESH_BINARY, 31, 10)),
+    ("otsu", lambda image, gray: _cv2().threshold(gray, 0, 255, _cv2().THRESH_BINARY + _cv2().THRESH_OTSU)[1]),
+    ("inverted", lambda image, gray: _cv2().bitwise_not(gray)),
+)
+QR_FAST_VARIANTS = 3
+
+# QR localisation runs on a 1/QR_LOCATE_DOWNSAMPLE copy; the crop keeps a margin around it
+QR_LOCATE_DOWNSAMPLE = 4
+QR_ROI_MARGIN = 0.2
+
+
+def locate_qr_roi(image, gray):
+    """
+    Find the QR code on a cheap downsampled copy and crop both images to it
+
+    Returns (image_roi, gray_roi), or None when no QR locality is found.
+    """
+    small = _cv2().resize(
+        gray, None, fx=1 / QR_LOCATE_DOWNSAMPLE, fy=1 / QR_LOCATE_DOWNSAMPLE,
+        interpolation=_cv2().INTER_LINEAR
+    )
+    found, points = _thread_qr_detector().detect(small)
+    if not found or points is None:
+        return None
+
+    pts = points.reshape(-1, 2) * QR_LOCATE_DOWNSAMPLE
+    x0, y0 = pts.min(axis=0)
+    x1, y1 = pts.max(axis=0)
+    mx, my = (x1 - x0) * QR_ROI_MARGIN, (y1 - y0) * QR_ROI_MARGIN
+    height, width = gray.shape[:2]
+    x0, y0 = max(0, int(x0 - mx)), max(0, int(y0 - my))
+    x1, y1 = min(width, int(x1 + mx) + 1), min(height, int(y1 + my) + 1)
+    if x1 - x0 < 21 or y1 - y0 < 21:  # Smaller than a version-1 QR code
+        return None
+    return image[y0:y1, x0:x1], gray[y0:y1, x0:x1]
 
-    raise Exception("Failed to render PDF at any DPI level")
+
+# ==================== OCR HELPERS ====================
+
+# Restrict recognition to digits and spaces (Aadhaar number fast path)
+DIGIT_WHITELIST = "0123456789 "
+
+# Uniform text block (ID card / certificate layouts), LSTM engine only,
+# and no second pass over an inverted image
+TESSERACT_CONFIG = '--psm 6 --oem 1 -c tessedit_do_invert=0'
+
+
+# Persistent Tesseract APIs are pooled per (lang, digits_only) rather than kept per
+# thread: each holds its traineddata in memory, and OCR runs on several executors.
+# At most TESS_APIS_PER_KEY exist per key; extra callers wait for a free one
+TESS_APIS_PER_KEY = int(os.getenv("TESS_APIS_PER_KEY", 2))
+_tess_pools: Dict[tuple, "queue.LifoQueue"] = {}
+_tess_pool_sizes: Dict[tuple, int] = {}
+_tess_pools_lock = threading.Lock()
+
+
+def _new_tess_api(lang: str, digits_only: bool):
+    api = tesserocr.PyTessBaseAPI(lang=lang, psm=tesserocr.PSM.SINGLE_BLOCK, oem=tesserocr.OEM.LSTM_ONLY)
+    api.SetVariable("tessedit_do_invert", "0")
+    if digits_only:
+        api.SetVariable("tessedit_char_whitelist", DIGIT_WHITELIST)
+    return api
+
+
+@contextmanager
+def _tess_api(lang: str, digits_only: bool = False):
+    """Borrow a Tesseract API (traineddata loaded once) for the duration of one OCR call"""
+    key = (lang, digits_only)
+    with _tess_pools_lock:
+        pool = _tess_pools.get(key)
+        if pool is None:
+            pool = _tess_pools[key] = queue.LifoQueue()
+            _tess_pool_sizes[key] = 0
+        create = pool.empty() and _tess_pool_sizes[key] < TESS_APIS_PER_KEY
+        if create:
+            _tess_pool_sizes[key] += 1
+
+    if create:
+        try:
+            api = _new_tess_api(lang, digits_only)
+        except Exception:
+            with _tess_pools_lock:
+                _tess_pool_sizes[key] -= 1
+            raise
+    else:
+        api = pool.get()
+    try:
+        yield api
+    finally:
+        pool.put(api)
+
+
+def ocr_image_to_string(image, lang: str, digits_only: bool = False) -> str:
+    """OCR a PIL image in-process via tesserocr, or via pytesseract if it isn't installed"""
+    if tesserocr is None:
+        config = TESSERACT_CONFIG
+        if digits_only:
+            config += ' -c tessedit_char_whitelist="' + DIGIT_WHITELIST + '"'
+        return _pytesseract().image_to_string(image, lang=lang, config=config)
+
+    with _tess_api(lang, digits_only) as api:
+        api.SetImage(image)
+        return api.GetUTF8Text()
+
+
+def ocr_image_file(file_path: str, lang: str) -> str:
+    """OCR an image file that Tesseract reads itself (Leptonica decode, no Pillow copy)"""
+    if tesserocr is None:
+        return _pytesseract().image_to_string(file_path, lang=lang, config=TESSERACT_CONFIG)
+
+    with _tess_api(lang) as api:
+        api.SetImageFile(file_path)
+        return api.GetUTF8Text()
+
+
+# Long-edge cap for full-page OCR; Tesseract is tuned for ~300 DPI and cost grows with pixels
+OCR_MAX_EDGE = 2000
+# Set OCR_PREPROCESS=0 to OCR the original image (for accuracy A/B checks)
+OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "1") == "1"
+
+
+def prepare_image_for_ocr(image: Image.Image, max_edge: int = OCR_MAX_EDGE) -> Image.Image:
+    """Grayscale and downscale a page image so its long edge is at most max_edge"""
+    if not OCR_PREPROCESS:
+        return image
+    if image.mode != "L":
+        image = image.convert("L")
+    longest = max(image.size)
+    if longest > max_edge:
+        scale = max_edge / longest
+        image = image.resize(
+            (int(image.width * scale), int(image.height * scale)), Image.LANCZOS
+        )
+    return image
+
+
+def prepare_gray_for_ocr(gray: np.ndarray, max_edge: int = OCR_MAX_EDGE) -> np.ndarray:
+    """Downscale an 8-bit grayscale array to at most max_edge and Otsu-binarise it once"""
+    if not OCR_PREPROCESS:
+        return gray
+    longest = max(gray.shape[:2])
+    if longest > max_edge:
+        scale = max_edge / longest
+        gray = _cv2().resize(gray, None, fx=scale, fy=scale, interpolation=_cv2().INTER_AREA)
+    _, binary = _cv2().threshold(gray, 0, 255, _cv2().THRESH_BINARY + _cv2().THRESH_OTSU)
+    return binary
+
+
+# Skew corrections outside this range (degrees) are treated as detection noise
+DESKEW_MIN_ANGLE = 0.5
+DESKEW_MAX_ANGLE = 15.0
+
+
+def deskew_binary(binary: np.ndarray) -> np.ndarray:
+    """Rotate a black-on-white binary scan so its text block is level"""
+    coords = _cv2().findNonZero(_cv2().bitwise_not(binary))
+    if coords is None:
+        return binary
+    angle = _cv2().minAreaRect(coords)[-1]
+    # minAreaRect reports (0, 90]; map to the smallest rotation either way
+    if angle > 45:
+        angle -= 90
+    if not DESKEW_MIN_ANGLE <= abs(angle) <= DESKEW_MAX_ANGLE:
+        return binary
+    height, width = binary.shape[:2]
+    matrix = _cv2().getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return _cv2().warpAffine(
+        binary, matrix, (width, height),
+        flags=_cv2().INTER_NEAREST, borderMode=_cv2().BORDER_CONSTANT, borderValue=255
+    )
+
+
+def load_certificate_for_ocr(file_path: str, gray: Optional[np.ndarray] = None) -> Image.Image:
+    """
+    Scanned certificate ready for Tesseract: downscaled, Otsu-binarised and deskewed
+
+    Pass gray when the file is already decoded; files OpenCV can't read are
+    handed over as-is.
+    """
+    if gray is None:
+        gray = _cv2().imread(file_path, _cv2().IMREAD_GRAYSCALE)
+        if gray is None:
+            return Image.open(file_path)
+    if OCR_PREPROCESS:
+        gray = deskew_binary(prepare_gray_for_ocr(gray))
+    return Image.fromarray(gray)
+
+
+# Tesseract can deadlock on very long file lists, so batches are chunked
+OCR_BATCH_CHUNK_SIZE = 50
+
+
+def ocr_image_files_batch(file_paths: List[str], lang: str = 'eng') -> List[str]:
+    """
+    OCR many image files with one Tesseract process per chunk
+    Tesseract reads a list file and separates each image's text with a form feed
+    """
+    texts = []
+    for start in range(0, len(file_paths), OCR_BATCH_CHUNK_SIZE):
+        chunk = file_paths[start:start + OCR_BATCH_CHUNK_SIZE]
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("\n".join(os.path.abspath(path) for path in chunk))
+            list_file = f.name
+        try:
+            combined = _pytesseract().image_to_string(list_file, lang=lang, config=TESSERACT_CONFIG)
+        finally:
+            os.remove(list_file)
+
+        pages = combined.split("\x0c")[:len(chunk)]
+        pages += [""] * (len(chunk) - len(pages))
+        texts.extend(pages)
+    return texts
 
 
 def decode_numeric_3byte(raw: bytes) -> bytes:
     """
     Decode SQR-3 format (3-digit decimal encoding)
     """
-    s = raw.decode()
-    if len(s) % 3 != 0:
+    if len(raw) % 3 != 0:
+        raise Exception("Invalid SQR-3 format")
+
+    # Every 3 ASCII digits -> one byte, as a single vectorised dot product
+    digits = np.frombuffer(raw, dtype=np.uint8).astype(np.int16) - ord('0')
+    if digits.size and (digits.min() < 0 or digits.max() > 9):
         raise Exception("Invalid SQR-3 format")
-    return bytes(int(s[i:i+3]) for i in range(0, len(s), 3))
+    values = digits.reshape(-1, 3) @ np.array([100, 10, 1], dtype=np.int16)
+    if values.size and values.max() > 255:
+        raise Exception("Invalid SQR-3 format")
+    return values.astype(np.uint8).tobytes()
 
 
 def parse_sqr3(raw: bytes) -> Dict:
@@ -107,6 +547,11 @@ def parse_sqr3(raw: bytes) -> Dict:
     return {"xml": xml, "photo": photo, "signature": signature}
 
 
+# zlib stream headers (CMF/FLG for the default, fastest and best compression levels)
+_ZLIB_HEADERS = (b"\x78\x01", b"\x78\x5e", b"\x78\x9c", b"\x78\xda")
+_BASE64_RE = re.compile(rb"[A-Za-z0-9+/]+={0,2}")
+
+
 def parse_qr_universal(raw: bytes) -> Dict:
     """
     Universal Aadhaar QR parser
@@ -115,88 +560,335 @@ def parse_qr_universal(raw: bytes) -> Dict:
     - Base64 / zlib compressed XML
     - Plain XML
     """
-    # Try SQR-3 (all digits, divisible by 3)
-    s = raw.decode(errors='ignore')
-    if s.isdigit() and len(s) % 3 == 0:
+    # Dispatch on the leading bytes; only the chosen decoder can raise
+    if raw.isdigit() and len(raw) % 3 == 0:
+        # SQR-3 (all digits, divisible by 3)
         try:
             return parse_sqr3(raw)
         except Exception:
             pass
 
-    # Try plain XML
-    if raw.startswith(b"<") or b"<" in raw[:10]:
+    elif raw.startswith(b"<") or b"<" in raw[:10]:
+        # Plain XML
         try:
             return {"xml": raw.decode(), "photo": None}
-        except:
+        except UnicodeDecodeError:
             pass
 
-    # Try zlib / gzip decompression
-    try:
-        xml_dec = zlib.decompress(raw).decode()
-        return {"xml": xml_dec, "photo": None}
-    except:
-        pass
+    elif raw[:2] in _ZLIB_HEADERS:
+        # zlib compressed XML
+        try:
+            return {"xml": zlib.decompress(raw).decode(), "photo": None}
+        except (zlib.error, UnicodeDecodeError):
+            pass
 
-    # Try Base64 decode + decompress (newer PDFs)
-    try:
-        decoded = base64.b64decode(raw)
-        xml_dec = zlib.decompress(decoded).decode()
-        return {"xml": xml_dec, "photo": None}
-    except:
-        pass
+    elif len(raw) % 4 == 0 and _BASE64_RE.fullmatch(raw):
+        # Base64 decode + decompress (newer PDFs)
+        try:
+            return {"xml": zlib.decompress(base64.b64decode(raw)).decode(), "photo": None}
+        except (ValueError, zlib.error, UnicodeDecodeError):
+            pass
 
     raise Exception(f"Unknown QR format, first 50 bytes: {raw[:50]}")
 
 
+_xml_thread_local = threading.local()
+
+
+def _aadhaar_xml_parser() -> "etree.XMLParser":
+    """
+    Reusable libxml2 parser per thread (lxml parsers must not be shared across threads)
+    Recovers from malformed QR XML; entities and network access stay disabled.
+    """
+    parser = getattr(_xml_thread_local, "parser", None)
+    if parser is None:
+        parser = _xml_thread_local.parser = etree.XMLParser(
+            recover=True, huge_tree=False, resolve_entities=False, no_network=True
+        )
+    return parser
+
+
+def parse_aadhaar_xml(xml) -> Optional["etree._Element"]:
+    """Parse Aadhaar QR XML (str or bytes) with the cached parser; None if unparseable"""
+    raw = xml.encode('utf-8') if isinstance(xml, str) else xml
+    return etree.fromstring(raw, _aadhaar_xml_parser())
+
+
+# Address components in display order; empty ones are skipped
+AADHAAR_ADDRESS_FIELDS = ('co', 'loc', 'vtcName', 'districtName', 'stateName')
+
+
 def extract_fields_from_xml(xml: str) -> Dict:
     """
     Extract Aadhaar fields from XML
     """
     try:
-        root = ET.fromstring(xml)
+        root = parse_aadhaar_xml(xml)
+        if root is None:
+            return {}
         return {
             "aadhaar_number": root.get('uid', ''),
             "name": root.get('name', ''),
             "dob": root.get('dob', ''),
             "gender": root.get('gender', ''),
-            "address": f"{root.get('co', '')}, {root.get('loc', '')}, {root.get('vtcName', '')}, {root.get('districtName', '')}, {root.get('stateName', '')}".strip(", "),
+            "address": ", ".join(p for p in map(root.get, AADHAAR_ADDRESS_FIELDS) if p),
             "pincode": root.get('pc', ''),
             "qr_verified": True
         }
     except Exception as e:
-        print(f"⚠️  XML parsing error: {e}")
+        logger.warning("XML parsing error: %s", e)
         return {}
 
 
+# ==================== KEYWORD MATCHING HELPERS ====================
+
+def normalize_text(text: str) -> str:
+    """
+    Casefolded NFC form used on both sides of every keyword/name match
+    (Indic text can arrive with decomposed vowel signs and nuktas)
+    """
+    return unicodedata.normalize("NFC", text.casefold())
+
+
+def build_keyword_automaton(keywords: List[str]) -> "ahocorasick.Automaton":
+    """
+    Build an Aho-Corasick automaton that finds all keywords in one pass
+    (a tuple of UTF-8 encoded keywords when pyahocorasick isn't installed)
+    """
+    if ahocorasick is None:
+        return tuple(dict.fromkeys(kw.encode("utf-8") for kw in keywords))
+
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+
+def find_keywords(automaton: "ahocorasick.Automaton", text: str) -> set:
+    """Set of distinct keywords from the automaton that occur in text"""
+    if len(automaton) == 0:
+        return set()
+    if ahocorasick is None:
+        # C-level substring search on the encoded text, one memmem per keyword
+        text_bytes = text.encode("utf-8", "ignore")
+        return {kw.decode("utf-8") for kw in automaton if kw in text_bytes}
+    return {kw for _, kw in automaton.iter(text)}
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_keyword_automaton(keywords: tuple) -> "ahocorasick.Automaton":
+    """Memoized automaton, so a repeated keyword list (e.g. one user's name variations) is built once"""
+    return build_keyword_automaton(list(keywords))
+
+
+def contains_any(keywords: List[str], text: str) -> bool:
+    """True if any keyword occurs in text (single scan over the text)"""
+    automaton = _cached_keyword_automaton(tuple(keywords))
+    if len(automaton) == 0:
+        return False
+    if ahocorasick is None:
+        return bool(find_keywords(automaton, text))
+    return next(automaton.iter(text), None) is not None
+
+
+def count_parts_found(part_variations: List[List[str]], text: str) -> int:
+    """
+    Number of name parts with at least one of their variations in text
+    All parts' variations go into one automaton, so the text is scanned once.
+    """
+    if ahocorasick is None:
+        text_bytes = text.encode("utf-8", "ignore")
+        return sum(
+            1 for variations in part_variations
+            if any(v.encode("utf-8") in text_bytes for v in variations)
+        )
+
+    # A variation can belong to several parts (e.g. a repeated name), so values are index tuples
+    automaton = ahocorasick.Automaton()
+    for index, variations in enumerate(part_variations):
+        for v in variations:
+            if v:
+                automaton.add_word(v, automaton.get(v, ()) + (index,))
+    if len(automaton) == 0:
+        return 0
+    automaton.make_automaton()
+
+    found = set()
+    for _, indexes in automaton.iter(text):
+        found.update(indexes)
+    return len(found)
+
+
+# Caste certificate keywords in multiple languages
+CASTE_ENGLISH_KEYWORDS = ['caste', 'certificate', 'scheduled caste', 'scheduled tribe', 'sc', 'st', 'government', 'community']
+CASTE_HINDI_KEYWORDS = ['जाति', 'प्रमाण', 'अनुसूचित', 'सरकार', 'समुदाय']
+CASTE_MARATHI_KEYWORDS = ['जात', 'प्रमाणपत्र', 'जमात', 'अनुसूचित']
+CASTE_KEYWORDS = [
+    normalize_text(kw) for kw in CASTE_ENGLISH_KEYWORDS + CASTE_HINDI_KEYWORDS + CASTE_MARATHI_KEYWORDS
+]
+_CASTE_KEYWORD_AUTOMATON = build_keyword_automaton(CASTE_KEYWORDS)
+
+# Income certificate keywords per language (a word listed under two languages counts for both)
+_RAW_INCOME_KEYWORDS = {
+    'english': frozenset({'income', 'certificate', 'annual', 'year', 'government', 'tehsildar', 'revenue', 'valid', 'financial'}),
+    'hindi': frozenset({'आय', 'प्रमाण', 'पत्र', 'वार्षिक', 'रुपये', 'तहसीलदार', 'शासन'}),
+    'marathi': frozenset({'उत्पन्न', 'दाखला', 'प्रमाणपत्र', 'वार्षिक', 'वर्ष', 'तहसीलदार', 'शासन', 'महा', 'सेवा'}),
+    'tamil': frozenset({'வருமானம்', 'சான்றிதழ்', 'ஆண்டு', 'வட்டாட்சியர்', 'அரசு'}),
+    'telugu': frozenset({'ఆదాయ', 'ధృవీకరణ', 'పత్రం', 'సంవత్సర', 'తహసీల్దార్', 'ప్రభుత్వం'}),
+    'kannada': frozenset({'ಆದಾಯ', 'ಪ್ರಮಾಣ', 'ಪತ್ರ', 'ವಾರ್ಷಿಕ', 'ತಹಶೀಲ್ದార్', 'ಸರ್ಕಾರ'}),
+    'malayalam': frozenset({'വരുമാന', 'സർട്ടിഫിക്കറ്റ്', 'വാർഷിക', 'തഹസിൽദാർ', 'സർക്കാർ'}),
+    'bengali': frozenset({'আয়ের', 'প্রশংসাপত্র', 'বাৎসরিক', 'রোজগার', 'তহশিলদার', 'সরকার'}),
+    'gujarati': frozenset({'આવક', 'દાખલો', 'પ્રમાણપત્ર', 'વાર્ષિક', 'મામલતદાર', 'સરકાર'}),
+    'punjabi': frozenset({'ਆਮਦਨ', 'ਸਰਟੀਫਿਕੇਟ', 'ਸਾਲਾਨਾ', 'ਤਹਿਸੀਲਦਾਰ', 'ਸਰਕਾਰ'})
+}
+INCOME_KEYWORDS = {lang: frozenset(map(normalize_text, kws)) for lang, kws in _RAW_INCOME_KEYWORDS.items()}
+INCOME_ALL_KEYWORDS = frozenset().union(*INCOME_KEYWORDS.values())
+_INCOME_KEYWORD_AUTOMATON = build_keyword_automaton(sorted(INCOME_ALL_KEYWORDS))
+
+
 # ==================== ENHANCED DOCUMENT VERIFICATION AGENT ====================
 
 
 import requests
 import json
+from requests.adapters import HTTPAdapter
+
+# Pooled keep-alive session and workers for the transliteration API
+_translit_session = requests.Session()
+_translit_session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+_TRANSLIT_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# Persistent transliteration cache shared by workers and restarts
+TRANSLIT_CACHE_PATH = os.getenv(
+    "TRANSLIT_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "fairclaim", "translit.db")
+)
+_translit_thread_local = threading.local()
+
+
+def _translit_db() -> sqlite3.Connection:
+    """sqlite3 connections can't be shared across threads, so keep one per worker thread"""
+    conn = getattr(_translit_thread_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(TRANSLIT_CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(TRANSLIT_CACHE_PATH, timeout=5)
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS translit (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        _translit_thread_local.conn = conn
+    return conn
+
+
+def _translit_disk_get(key: str) -> Optional[List[str]]:
+    try:
+        row = _translit_db().execute("SELECT value FROM translit WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _translit_disk_put(key: str, value: List[str]) -> None:
+    try:
+        conn = _translit_db()
+        # The connection context manager only scopes the transaction; it never closes
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO translit VALUES (?, ?)", (key, json.dumps(value)))
+    except (OSError, sqlite3.Error):
+        pass
+
+
+@functools.lru_cache(maxsize=4096)
+def _transliterate_cached(text: str, lang_code: str) -> tuple:
+    """Transliteration candidates; raises on failure so errors are never cached"""
+    key = hashlib.blake2b(f"{text}|{lang_code}".encode("utf-8"), digest_size=16).hexdigest()
+    cached = _translit_disk_get(key)
+    if cached is not None:
+        return tuple(cached)
 
-def transliterate_text(text, lang_code):
-    if not text or not lang_code: return [text]
     url = "https://inputtools.google.com/request"
     params = {"text": text, "itc": f"{lang_code}-t-i0-und", "num": "5", "cp": "0", "cs": "1", "ie": "utf-8", "oe": "utf-8", "app": "demopage"}
+    response = _translit_session.get(url, params=params, timeout=2)
+    result = response.json() if response.status_code == 200 else None
+    if not result or result[0] != "SUCCESS":
+        raise ValueError("transliteration failed")
+
+    candidates = result[1][0][1]
+    _translit_disk_put(key, candidates)
+    return tuple(candidates)
+
+
+def transliterate_text(text, lang_code):
+    if not text or not lang_code: return [text]
     try:
-        response = requests.get(url, params=params, timeout=2)
-        if response.status_code == 200 and response.json()[0] == "SUCCESS":
-            return response.json()[1][0][1]
-    except: pass
-    return [text]
+        return list(_transliterate_cached(text, lang_code))
+    except Exception:
+        return [text]
+
+def get_name_variations(name, languages=['hin', 'mar'], strict=False):
+    """
+    Lowercased spellings of a name (and its parts) in the given languages' scripts
 
-def get_name_variations(name, languages=['hin', 'mar']):
+    With strict=True a failed transliteration raises instead of being skipped.
+    """
+    translit = (lambda text, code: _transliterate_cached(text, code)) if strict else transliterate_text
     variations = {name.lower()}
     code_map = {'hindi': 'hi', 'marathi': 'mr', 'tamil': 'ta', 'telugu': 'te', 'kannada': 'kn', 'malayalam': 'ml', 'bengali': 'bn', 'gujarati': 'gu', 'punjabi': 'pa'}
-    parts = name.split()
-    for lang in languages:
-        code = code_map.get(lang, 'hi')
-        variations.update(t.lower() for t in transliterate_text(name, code))
-        for part in parts:
-            variations.update(t.lower() for t in transliterate_text(part, code))
+    # Distinct parts only, and skip the part that is the whole (single-word) name
+    parts = [part for part in dict.fromkeys(name.split()) if part != name]
+    codes = dict.fromkeys(code_map.get(lang, 'hi') for lang in languages)
+    pairs = [(text, code) for code in codes for text in [name] + parts]
+
+    # Requests are independent network waits, so issue them all at once
+    for result in _TRANSLIT_EXECUTOR.map(lambda pair: translit(*pair), pairs):
+        variations.update(t.lower() for t in result)
     return list(variations)
 
 
+@functools.lru_cache(maxsize=4096)
+def _cached_name_variations(name_lower: str, langs_key: tuple) -> tuple:
+    """
+    Memoized name variations; call as _cached_name_variations(name.lower(), tuple(sorted(langs)))
+
+    Strict, so a transient transliteration failure raises instead of being
+    cached as a degraded result.
+    """
+    return tuple(dict.fromkeys(
+        normalize_text(v) for v in get_name_variations(name_lower, list(langs_key), strict=True)
+    ))
+
+
+# Name parts are expanded concurrently; each part's own transliteration requests
+# run on _TRANSLIT_EXECUTOR, so this must be a separate pool
+_NAME_PART_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="name-parts")
+
+
+def name_part_variations(parts: List[str], languages: List[str]) -> List[tuple]:
+    """Memoized variations of every name part, generated concurrently (falls back to the bare part)"""
+    langs_key = tuple(sorted(languages))
+
+    def variations(part: str) -> tuple:
+        try:
+            return _cached_name_variations(part.lower(), langs_key)
+        except Exception:
+            return (part.lower(),)
+
+    if len(parts) <= 1:
+        return [variations(part) for part in parts]
+    return list(_NAME_PART_EXECUTOR.map(variations, parts))
+
+
+# Set AADHAAR_SPECULATIVE_OCR=1 to start the OCR fallback alongside QR detection:
+# worst-case latency becomes max(QR, OCR) instead of QR + OCR, at the cost of
+# OCR CPU that is thrown away whenever the QR code verifies
+AADHAAR_SPECULATIVE_OCR = os.getenv("AADHAAR_SPECULATIVE_OCR", "0") == "1"
+_SPECULATIVE_OCR_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr-spec")
+
+# Certificate OCR text keyed by (file content hash, language or "auto"), so a
+# re-uploaded scan skips Tesseract even when the user details changed
+OCR_TEXT_CACHE_SIZE = 512
+_ocr_text_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_ocr_text_cache_lock = threading.Lock()
+
+
 class DocumentVerificationAgent:
     """
     Production-ready verification with regional language support + PDF QR parsing
@@ -221,8 +913,39 @@ class DocumentVerificationAgent:
         'punjabi': 'pan'
     }
 
+    # Tesseract OSD script name -> OCR language string
+    SCRIPT_LANGUAGES = {
+        'Latin': 'eng',
+        'Devanagari': 'eng+hin',
+        'Tamil': 'eng+tam',
+        'Telugu': 'eng+tel',
+        'Bengali': 'eng+ben',
+        'Kannada': 'eng+kan',
+        'Malayalam': 'eng+mal',
+        'Gujarati': 'eng+guj',
+        'Gurmukhi': 'eng+pan'
+    }
+
+    # Certificates are often Marathi, which the Hindi model reads less reliably
+    CERTIFICATE_SCRIPT_LANGUAGES = {**SCRIPT_LANGUAGES, 'Devanagari': 'eng+hin+mar'}
+
     def __init__(self):
-        self.verification_steps = []
+        self._steps = []
+
+    def _add(self, step: str, timestamp: bool = False, **fields) -> None:
+        """Record an audit step cheaply; dicts are only built by _audit_trail()"""
+        self._steps.append((step, time.time() if timestamp else None, fields))
+
+    def _audit_trail(self) -> List[Dict]:
+        """Materialize the recorded steps as JSON-ready dicts"""
+        trail = []
+        for step, ts, fields in self._steps:
+            entry = {"step": step}
+            if ts is not None:
+                entry["timestamp"] = datetime.utcfromtimestamp(ts).isoformat()
+            entry.update(fields)
+            trail.append(entry)
+        return trail
 
     def verify_aadhaar_card(
         self,
@@ -236,72 +959,127 @@ class DocumentVerificationAgent:
         NEW: Now handles both PDF and image files
         """
         try:
-            self.verification_steps = []  # Reset for each verification
+            with open(file_path, "rb") as f:
+                file_bytes = f.read()
+        except Exception as e:
+            self._steps = []
+            return {
+                "verified": False,
+                "error": f"Verification failed: {str(e)}",
+                "audit_trail": self._audit_trail()
+            }
 
-            # Check file type
-            file_ext = os.path.splitext(file_path)[1].lower()
+        file_ext = os.path.splitext(file_path)[1].lower()
+        return self.verify_aadhaar_card_bytes(file_bytes, file_ext, user_aadhaar, user_name)
+
+    def verify_aadhaar_card_bytes(
+        self,
+        file_bytes: bytes,
+        file_ext: str,
+        user_aadhaar: str,
+        user_name: str
+    ) -> Dict:
+        """
+        Aadhaar verification straight from the uploaded bytes (no disk round-trip)
+
+        Args:
+            file_bytes: Raw upload content (PDF or image)
+            file_ext: Lowercased extension including the dot, e.g. ".pdf"
+        """
+        try:
+            self._steps = []  # Reset for each verification
 
             # Handle PDF files
             if file_ext == '.pdf':
-                self.verification_steps.append({
-                    "step": "PDF_DETECTION",
-                    "status": "detected",
-                    "note": "PDF file detected, converting to image..."
-                })
+                self._add(
+                    "PDF_DETECTION",
+                    status="detected",
+                    note="PDF file detected, converting to image..."
+                )
 
                 try:
-                    # Convert PDF to image
-                    pil_image = render_pdf_to_image(file_path)
-                    image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-
-                    self.verification_steps.append({
-                        "step": "PDF_CONVERSION",
-                        "status": "success"
-                    })
+                    # Convert PDF to image; stays RGB (the QR decoders and
+                    # grayscale/threshold kernels don't care about channel order)
+                    pil_image = render_pdf_to_image(file_bytes)
+                    image = np.asarray(pil_image)
+                    gray = _cv2().cvtColor(image, _cv2().COLOR_RGB2GRAY)
+
+                    self._add("PDF_CONVERSION", status="success")
                 except Exception as e:
-                    self.verification_steps.append({
-                        "step": "PDF_CONVERSION",
-                        "status": "failed",
-                        "error": str(e)
-                    })
+                    self._add("PDF_CONVERSION", status="failed", error=str(e))
                     return {
                         "verified": False,
                         "error": f"PDF conversion failed: {str(e)}",
-                        "audit_trail": self.verification_steps
+                        "audit_trail": self._audit_trail()
                     }
             else:
-                # Handle image files
-                image = cv2.imread(file_path)
+                # Handle image files (decoded once, shared by QR and OCR paths)
+                raw = np.frombuffer(file_bytes, dtype=np.uint8)
+                image = _cv2().imdecode(raw, _cv2().IMREAD_COLOR)
                 if image is None:
                     return {
                         "verified": False,
                         "error": "Unable to read image file",
-                        "audit_trail": self.verification_steps
+                        "audit_trail": self._audit_trail()
                     }
+                gray = _cv2().cvtColor(image, _cv2().COLOR_BGR2GRAY)
+
+            # Speculative OCR runs on its own agent so the two audit trails don't interleave
+            ocr_future = None
+            if AADHAAR_SPECULATIVE_OCR:
+                ocr_future = _SPECULATIVE_OCR_EXECUTOR.submit(
+                    DocumentVerificationAgent()._verify_aadhaar_multilang_ocr,
+                    image, gray, user_aadhaar, user_name
+                )
 
             # Step 1: Try QR Code Extraction (Most Reliable)
             qr_result = self._extract_and_verify_aadhaar_qr(
-                image, user_aadhaar, user_name, file_path, file_ext
+                image, gray, user_aadhaar, user_name, file_ext=file_ext
             )
 
             if qr_result.get("verified") is not None:
+                if ocr_future is not None:
+                    ocr_future.cancel()  # No-op if already running; its result is discarded
                 return qr_result
 
+            # PDFs: climb the DPI ladder only while QR detection keeps failing
+            if file_ext == '.pdf':
+                for dpi in PDF_RENDER_DPI_LADDER[1:]:
+                    self._add("PDF_RERENDER", status="started", dpi=dpi)
+                    try:
+                        pil_image = render_pdf_to_image(file_bytes, dpi=dpi)
+                        hi_image = np.asarray(pil_image)
+                        qr_result = self._extract_and_verify_aadhaar_qr(
+                            hi_image, _cv2().cvtColor(hi_image, _cv2().COLOR_RGB2GRAY),
+                            user_aadhaar, user_name, file_ext=file_ext
+                        )
+                        if qr_result.get("verified") is not None:
+                            return qr_result
+                    except Exception as e:
+                        self._add("PDF_RERENDER", status="failed", dpi=dpi, error=str(e))
+
+            # OCR runs on the first (300 DPI) render, which is plenty for text
+
             # Step 2: Fallback to Multi-language OCR
+            if ocr_future is not None:
+                ocr_result = ocr_future.result()
+                ocr_result["audit_trail"] = self._audit_trail() + ocr_result.get("audit_trail", [])
+                return ocr_result
             return self._verify_aadhaar_multilang_ocr(
-                file_path, user_aadhaar, user_name
+                image, gray, user_aadhaar, user_name
             )
 
         except Exception as e:
             return {
                 "verified": False,
                 "error": f"Verification failed: {str(e)}",
-                "audit_trail": self.verification_steps
+                "audit_trail": self._audit_trail()
             }
 
     def _extract_and_verify_aadhaar_qr(
         self,
         image,
+        gray,
         user_aadhaar: str,
         user_name: str,
         file_path: str = None,
@@ -310,126 +1088,90 @@ class DocumentVerificationAgent:
         """
         ENHANCED: Extract QR code with PDF support and universal parsing
 
-        Methods tried in order:
-        1. Enhanced QR detection for PDFs (9+ methods)
-        2. pyzbar on original/grayscale images
-        3. OpenCV QRCodeDetector (4 sub-methods)
+        Methods tried in order (OpenCV then pyzbar on each variant):
+        0. WeChat CNN detector on the full image (opencv-contrib only)
+        1. Direct / grayscale / CLAHE on a downscaled copy (large scans only)
+        2. Direct / grayscale / CLAHE at full resolution
+        3. Adaptive / Otsu threshold and inverted variants (PDFs only)
         """
-        self.verification_steps.append({
-            "step": "QR_EXTRACTION_ATTEMPT",
-            "timestamp": datetime.utcnow().isoformat(),
-            "status": "started"
-        })
+        self._add("QR_EXTRACTION_ATTEMPT", timestamp=True, status="started")
+
+        # One CNN pass usually succeeds where the stock detector needs the variants below
+        qr_data = decode_qr_wechat(image)
+        if qr_data:
+            self._add("WECHAT_QR_DETECTION", status="success")
+
+        # Try a downscaled copy first; full resolution only if that fails
+        scale = min(1.0, QR_DOWNSCALE_MAX_EDGE / max(image.shape[:2]))
+        if not qr_data and scale < 1.0:
+            self._add("TRYING_DOWNSCALED_QR_DETECTION", status="started", scale=round(scale, 3))
+            image_small = _cv2().resize(image, None, fx=scale, fy=scale, interpolation=_cv2().INTER_AREA)
+            gray_small = _cv2().resize(gray, None, fx=scale, fy=scale, interpolation=_cv2().INTER_AREA)
+            qr_data = self._extract_qr_with_opencv(image_small, gray_small)
+
+        # Full resolution, cropped to the QR locality when it can be found
+        if not qr_data:
+            if pyzbar is None:
+                self._add("PYZBAR_NOT_AVAILABLE", note="pyzbar library not installed")
 
-        qr_data = None
+            roi = locate_qr_roi(image, gray)
+            if roi is not None:
+                image, gray = roi
+                self._add("QR_ROI_CROP", status="success", size=f"{gray.shape[1]}x{gray.shape[0]}")
+            else:
+                self._add("QR_ROI_CROP", status="not_found", note="Using the full image")
 
-        # ENHANCED: Try advanced QR detection for PDFs
-        if file_ext == '.pdf' or (file_path and file_path.lower().endswith('.pdf')):
-            self.verification_steps.append({
-                "step": "TRYING_ENHANCED_PDF_QR_DETECTION",
-                "status": "started",
-                "methods": "9+ advanced techniques"
-            })
+            self._add("TRYING_OPENCV_DETECTOR", status="started")
+            qr_data = self._extract_qr_with_opencv(image, gray)
+
+        # ENHANCED: threshold variants for PDFs (only the ones not tried above)
+        if not qr_data and (file_ext == '.pdf' or (file_path and file_path.lower().endswith('.pdf'))):
+            self._add(
+                "TRYING_ENHANCED_PDF_QR_DETECTION",
+                status="started",
+                methods=", ".join(name for name, _ in QR_VARIANTS[QR_FAST_VARIANTS:])
+            )
 
             try:
-                qr_data = self._detect_qr_enhanced(image)
-            except Exception as e:
-                self.verification_steps.append({
-                    "step": "ENHANCED_PDF_QR_DETECTION",
-                    "status": "failed",
-                    "error": str(e)
-                })
-
-        # Method 1: pyzbar (if available and not already found)
-        if not qr_data and pyzbar is not None:
-            self.verification_steps.append({
-                "step": "TRYING_PYZBAR",
-                "status": "started"
-            })
-
-            # Try original image
-            try:
-                decoded = pyzbar.decode(image)
-                if decoded:
-                    qr_data = self._parse_qr_objects(decoded)
-                    if qr_data:
-                        self.verification_steps.append({
-                            "step": "PYZBAR_SUCCESS",
-                            "method": "direct_image"
-                        })
+                qr_data = self._detect_qr_enhanced(image, gray)
             except Exception as e:
-                self.verification_steps.append({
-                    "step": "PYZBAR_ERROR",
-                    "error": str(e)
-                })
-
-            # Try grayscale if still no data
-            if not qr_data:
-                try:
-                    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                    decoded = pyzbar.decode(gray)
-                    if decoded:
-                        qr_data = self._parse_qr_objects(decoded)
-                        if qr_data:
-                            self.verification_steps.append({
-                                "step": "PYZBAR_SUCCESS",
-                                "method": "grayscale_image"
-                            })
-                except Exception as e:
-                    self.verification_steps.append({
-                        "step": "PYZBAR_GRAYSCALE_ERROR",
-                        "error": str(e)
-                    })
-        else:
-            if not qr_data:
-                self.verification_steps.append({
-                    "step": "PYZBAR_NOT_AVAILABLE",
-                    "note": "pyzbar library not installed"
-                })
-
-        # Method 2: OpenCV QR Detector
-        if not qr_data:
-            self.verification_steps.append({
-                "step": "TRYING_OPENCV_DETECTOR",
-                "status": "started"
-            })
-            qr_data = self._extract_qr_with_opencv(image)
+                self._add("ENHANCED_PDF_QR_DETECTION", status="failed", error=str(e))
 
         # If no QR found after all methods, return empty to trigger OCR fallback
         if not qr_data:
-            self.verification_steps.append({
-                "step": "QR_EXTRACTION",
-                "status": "failed_all_methods",
-                "fallback": "OCR",
-                "note": "QR code not detected. Falling back to OCR extraction."
-            })
+            self._add(
+                "QR_EXTRACTION",
+                status="failed_all_methods",
+                fallback="OCR",
+                note="QR code not detected. Falling back to OCR extraction."
+            )
             return {}  # Trigger OCR fallback
 
         # QR Code successfully extracted! Now parse with universal parser
-        self.verification_steps.append({
-            "step": "QR_EXTRACTION",
-            "status": "success",
-            "qr_data_length": len(qr_data) if isinstance(qr_data, (str, bytes)) else 0
-        })
+        self._add(
+            "QR_EXTRACTION",
+            status="success",
+            qr_data_length=len(qr_data) if isinstance(qr_data, (str, bytes)) else 0
+        )
 
         # Parse Aadhaar QR with universal parser
         extracted_data = self._parse_aadhaar_qr_enhanced(qr_data)
 
         if not extracted_data.get("aadhaar_number"):
-            self.verification_steps.append({
-                "step": "QR_PARSING",
-                "status": "failed",
-                "reason": "Could not extract Aadhaar number from QR data",
-                "fallback": "OCR"
-            })
+            self._add(
+                "QR_PARSING",
+                status="failed",
+                reason="Could not extract Aadhaar number from QR data",
+                fallback="OCR"
+            )
             return {}  # Trigger OCR fallback
 
-        self.verification_steps.append({
-            "step": "QR_PARSING",
-            "status": "success",
-            "extracted_aadhaar": "****" + extracted_data["aadhaar_number"][-4:] + " (masked)",
-            "extracted_name": extracted_data.get("name", "N/A")
-        })
+        self._add(
+            "QR_PARSING",
+            status="success",
+            extracted_aadhaar="****" + extracted_data["aadhaar_number"][-4:] + " (masked)",
+            extracted_name=extracted_data.get("name", "N/A")
+        )
 
                 # SECURITY CHECK 1: Verify Aadhaar number match
         # MODIFIED: Accept if either full number matches OR last 4 digits match (for demo purposes)
@@ -440,13 +1182,13 @@ class DocumentVerificationAgent:
             is_last_4_match = extracted_data["aadhaar_number"][-4:] == user_aadhaar[-4:]
 
         if not is_full_match and not is_last_4_match:
-            self.verification_steps.append({
-                "step": "AADHAAR_VERIFICATION",
-                "status": "FAILED",
-                "reason": "Aadhaar number mismatch",
-                "expected_last_4": user_aadhaar[-4:] if user_aadhaar else "None",
-                "found_last_4": extracted_data.get("aadhaar_number", "")[-4:]
-            })
+            self._add(
+                "AADHAAR_VERIFICATION",
+                status="FAILED",
+                reason="Aadhaar number mismatch",
+                expected_last_4=user_aadhaar[-4:] if user_aadhaar else "None",
+                found_last_4=extracted_data.get("aadhaar_number", "")[-4:]
+            )
             return {
                 "verified": False,
                 "reason": "Aadhaar number mismatch",
@@ -454,21 +1196,17 @@ class DocumentVerificationAgent:
                 "security_alert": True,
                 "extracted_name": extracted_data.get("name", "Unknown"),
                 "user_name": user_name,
-                "audit_trail": self.verification_steps
+                "audit_trail": self._audit_trail()
             }
 
         if is_last_4_match and not is_full_match:
-             self.verification_steps.append({
-                "step": "AADHAAR_VERIFICATION",
-                "status": "PASSED_WITH_WARNING",
-                "match": "Last 4 digits match (Full number mismatch ignored for demo)"
-            })
+             self._add(
+                 "AADHAAR_VERIFICATION",
+                 status="PASSED_WITH_WARNING",
+                 match="Last 4 digits match (Full number mismatch ignored for demo)"
+             )
         else:
-            self.verification_steps.append({
-                "step": "AADHAAR_VERIFICATION",
-                "status": "PASSED",
-                "match": "Full Aadhaar number match"
-            })
+            self._add("AADHAAR_VERIFICATION", status="PASSED", match="Full Aadhaar number match")
 
         # SECURITY CHECK 2: Verify name match (fuzzy matching)
         name_score = self._fuzzy_match(
@@ -476,35 +1214,27 @@ class DocumentVerificationAgent:
             extracted_data["name"].lower().strip()
         )
 
-        self.verification_steps.append({
-            "step": "NAME_VERIFICATION",
-            "status": "checking",
-            "user_name": user_name,
-            "document_name": extracted_data["name"],
-            "similarity_score": round(name_score, 2),
-            "threshold": 0.65
-        })
+        self._add(
+            "NAME_VERIFICATION",
+            status="checking",
+            user_name=user_name,
+            document_name=extracted_data["name"],
+            similarity_score=round(name_score, 2),
+            threshold=0.65
+        )
 
         if name_score < 0.65:  # 65% similarity threshold
-            self.verification_steps.append({
-                "step": "NAME_VERIFICATION",
-                "status": "FAILED",
-                "reason": "Name similarity too low"
-            })
+            self._add("NAME_VERIFICATION", status="FAILED", reason="Name similarity too low")
             return {
                 "verified": False,
                 "reason": "Name mismatch",
                 "details": f"Name similarity too low. Expected: {user_name}, Found: {extracted_data['name']}",
                 "name_match_score": round(name_score, 2),
                 "security_alert": True,
-                "audit_trail": self.verification_steps
+                "audit_trail": self._audit_trail()
             }
 
-        self.verification_steps.append({
-            "step": "NAME_VERIFICATION",
-            "status": "PASSED",
-            "similarity_acceptable": True
-        })
+        self._add("NAME_VERIFICATION", status="PASSED", similarity_acceptable=True)
 
         # ALL CHECKS PASSED - SUCCESS!
         return {
@@ -520,71 +1250,22 @@ class DocumentVerificationAgent:
             "verification_method": "QR_CODE_VALIDATION_UNIVERSAL",
             "name_match_score": round(name_score, 2),
             "matched_fields": ["aadhaar_number", "name"],
-            "audit_trail": self.verification_steps
+            "audit_trail": self._audit_trail()
         }
 
-    def _detect_qr_enhanced(self, image) -> Optional[bytes]:
+    def _detect_qr_enhanced(self, image, gray) -> Optional[bytes]:
         """
-        ENHANCED QR detection with 9+ methods
-        Specifically designed for myAadhaar PDFs
+        ENHANCED QR detection on thresholded variants (tiled, one decode pass)
+        Specifically designed for myAadhaar PDFs; the direct, grayscale and
+        CLAHE variants have already been tried by _extract_qr_with_opencv
         """
-        detector = cv2.QRCodeDetector()
-
-        # Import pyzbar for enhanced detection
-        try:
-            from pyzbar.pyzbar import decode
-        except ImportError:
-            decode = None
-
-        # Method 1: Direct OpenCV
-        data, pts, _ = detector.detectAndDecode(image)
-        if data and len(data) > 50:
-            return data.encode()
-
-        # Method 2: pyzbar on original
-        if decode:
-            barcodes = decode(Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB)))
-            if barcodes:
-                return barcodes[0].data
-
-        # Method 3: Grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        data, pts, _ = detector.detectAndDecode(gray)
-        if data and len(data) > 50:
-            return data.encode()
-
-        # Method 4: Adaptive threshold
-        thr = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
-                                    cv2.THRESH_BINARY, 31, 10)
-        data, pts, _ = detector.detectAndDecode(thr)
-        if data and len(data) > 50:
-            return data.encode()
-
-        # Method 5: Otsu binarization
-        _, thr2 = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        data, pts, _ = detector.detectAndDecode(thr2)
-        if data and len(data) > 50:
-            return data.encode()
-
-        # Method 6: Inverted image
-        inv = cv2.bitwise_not(gray)
-        data, pts, _ = detector.detectAndDecode(inv)
-        if data and len(data) > 50:
-            return data.encode()
-
-        # Method 7: CLAHE enhancement
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-        clahe_img = clahe.apply(gray)
-        data, pts, _ = detector.detectAndDecode(clahe_img)
-        if data and len(data) > 50:
-            return data.encode()
-
-        # Method 8-9: pyzbar on processed images
-        if decode:
-            for img_variant in [gray, thr, thr2, inv, clahe_img]:
-                barcodes = decode(Image.fromarray(img_variant))
-                if barcodes:
-                    return barcodes[0].data
+        variants = QR_VARIANTS[QR_FAST_VARIANTS:]
+        found = _decode_qr_composite([build(image, gray) for _, build in variants])
+        if found:
+            data, index = found
+            method = variants[min(max(index, 0), len(variants) - 1)][0]
+            self._add("ENHANCED_PDF_QR_DETECTION", status="success", method=method)
+            return data if isinstance(data, bytes) else data.encode()
 
         # All methods failed
         return None
@@ -603,108 +1284,40 @@ class DocumentVerificationAgent:
 
             return {}
         except Exception as e:
-            self.verification_steps.append({
-                "step": "UNIVERSAL_QR_PARSING",
-                "status": "error",
-                "error": str(e)
-            })
+            self._add("UNIVERSAL_QR_PARSING", status="error", error=str(e))
 
             # Fallback to old XML parsing
             return self._parse_aadhaar_qr(qr_data)
 
-    def _parse_qr_objects(self, decoded_objects) -> Optional[str]:
+    def _extract_qr_with_opencv(self, image, gray) -> Optional[Union[str, bytes]]:
         """
-        Helper to parse QR objects from pyzbar
-        Extracts the QR data string from decoded objects
-        """
-        for obj in decoded_objects:
-            if obj.type == 'QRCODE':
-                try:
-                    qr_data = obj.data.decode('utf-8', errors='ignore') if isinstance(obj.data, bytes) else obj.data
-                    if len(qr_data) > 50:  # Valid Aadhaar QR should be substantial
-                        self.verification_steps.append({
-                            "step": "QR_DATA_EXTRACTED",
-                            "status": "success",
-                            "data_length": len(qr_data)
-                        })
-                        return qr_data
-                except Exception as e:
-                    self.verification_steps.append({
-                        "step": "QR_DATA_EXTRACTION",
-                        "status": "error",
-                        "error": str(e)
-                    })
-                    continue
-        return None
+        Fallback QR detection using OpenCV QRCodeDetector (+ pyzbar)
+        More reliable than pyzbar alone for certain image qualities
 
-    def _extract_qr_with_opencv(self, image) -> Optional[str]:
-        """
-        Fallback QR detection using OpenCV QRCodeDetector
-        More reliable than pyzbar for certain image qualities
+        All preprocessing variants are decoded concurrently; the first
+        successful decode wins and the remaining ones are cancelled.
         """
         try:
-            # Initialize OpenCV QR code detector
-            qr_detector = cv2.QRCodeDetector()
+            variants = QR_VARIANTS[:QR_FAST_VARIANTS]
 
-            # Method 1: Try with original image
-            data, bbox, _ = qr_detector.detectAndDecode(image)
-            if data and len(data) > 50:
-                self.verification_steps.append({
-                    "step": "QR_EXTRACTION_OPENCV",
-                    "status": "success",
-                    "method": "opencv_qr_detector_direct"
-                })
-                return data
-
-            # Method 2: Try with grayscale conversion
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            data, bbox, _ = qr_detector.detectAndDecode(gray)
-            if data and len(data) > 50:
-                self.verification_steps.append({
-                    "step": "QR_EXTRACTION_OPENCV",
-                    "status": "success",
-                    "method": "opencv_qr_detector_grayscale"
-                })
-                return data
-
-            # Method 3: Try with contrast enhancement
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            enhanced = clahe.apply(gray)
-            data, bbox, _ = qr_detector.detectAndDecode(enhanced)
-            if data and len(data) > 50:
-                self.verification_steps.append({
-                    "step": "QR_EXTRACTION_OPENCV",
-                    "status": "success",
-                    "method": "opencv_qr_detector_enhanced"
-                })
-                return data
-
-            # Method 4: Try with larger image
-            height, width = image.shape[:2]
-            resized = cv2.resize(image, (width * 2, height * 2), interpolation=cv2.INTER_CUBIC)
-            data, bbox, _ = qr_detector.detectAndDecode(resized)
-            if data and len(data) > 50:
-                self.verification_steps.append({
-                    "step": "QR_EXTRACTION_OPENCV",
-                    "status": "success",
-                    "method": "opencv_qr_detector_upscaled"
-                })
-                return data
+            futures = {
+                _QR_EXECUTOR.submit(_decode_qr_variant, lambda build=build: build(image, gray)): method
+                for method, build in variants
+            }
+            for future in as_completed(futures):
+                data = future.result()
+                if data:
+                    for other in futures:
+                        other.cancel()
+                    self._add("QR_EXTRACTION_OPENCV", status="success", method=futures[future])
+                    return data
 
             # No QR found with any method
-            self.verification_steps.append({
-                "step": "QR_EXTRACTION_OPENCV",
-                "status": "no_qr_found",
-                "methods_tried": 4
-            })
+            self._add("QR_EXTRACTION_OPENCV", status="no_qr_found", methods_tried=len(variants))
             return None
 
         except Exception as e:
-            self.verification_steps.append({
-                "step": "QR_EXTRACTION_OPENCV",
-                "status": "error",
-                "error": str(e)
-            })
+            self._add("QR_EXTRACTION_OPENCV", status="error", error=str(e))
             return None
 
     def _parse_aadhaar_qr(self, qr_data: str) -> Dict:
@@ -712,9 +1325,12 @@ class DocumentVerificationAgent:
         Parse Aadhaar QR code (XML format) - LEGACY FALLBACK
         Format: <uid="..." name="..." dob="..." gender="..." .../>
         """
+        raw = qr_data if isinstance(qr_data, bytes) else qr_data.encode('utf-8')
         try:
-            # Try XML parsing first
-            root = ET.fromstring(qr_data)
+            # Try XML parsing first (the recovering parser handles most damage)
+            root = parse_aadhaar_xml(raw)
+            if root is None:
+                raise ValueError("No XML root element")
             return {
                 "aadhaar_number": root.get('uid', ''),
                 "name": root.get('name', ''),
@@ -723,72 +1339,68 @@ class DocumentVerificationAgent:
                 "address": root.get('co', '') + ', ' + root.get('loc', ''),
                 "qr_verified": True
             }
-        except:
-            # Fallback: Regex extraction
-            patterns = {
-                "aadhaar_number": r'uid="(\d{12})"',
-                "name": r'name="([^"]+)"',
-                "dob": r'dob="([^"]+)"',
-                "gender": r'gender="([^"]+)"'
-            }
-
+        except (etree.XMLSyntaxError, ValueError):
+            # Last resort: Regex extraction
+            text = raw.decode('utf-8', errors='ignore')
             extracted = {}
-            for key, pattern in patterns.items():
-                match = re.search(pattern, qr_data, re.IGNORECASE)
+            for key, pattern in _AADHAAR_QR_FIELD_RES.items():
+                match = pattern.search(text)
                 extracted[key] = match.group(1) if match else ""
 
             return extracted
 
     def _verify_aadhaar_multilang_ocr(
         self,
-        file_path: str,
+        image,
+        gray,
         user_aadhaar: str,
         user_name: str
     ) -> Dict:
         """
         Fallback OCR with multi-language support
         Tries multiple languages to extract Aadhaar number
+        Reuses the already-decoded grayscale image instead of reopening the file
         """
-        self.verification_steps.append({
-            "step": "MULTILANG_OCR_FALLBACK",
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        self._add("MULTILANG_OCR_FALLBACK", timestamp=True)
 
-        image = Image.open(file_path)
+        # Downscale + binarise once; every OCR pass below reuses the result
+        image = Image.fromarray(prepare_gray_for_ocr(gray))
 
-        # Try English + Hindi (most common combination)
-        languages_to_try = ['eng+hin', 'eng', 'hin', 'eng+tam', 'eng+tel']
-
-        aadhaar_found = None
         name_found = False
 
-        for lang in languages_to_try:
-            try:
-                text = pytesseract.image_to_string(image, lang=lang)
-                self.verification_steps.append({
-                    "step": f"OCR_ATTEMPT_{lang}",
-                    "text_length": len(text)
-                })
-
-                # Extract Aadhaar number (always in digits)
-                aadhaar_pattern = r'\b\d{4}\s*\d{4}\s*\d{4}\b'
-                found_numbers = re.findall(aadhaar_pattern, text)
-
-                if found_numbers:
-                    aadhaar_found = found_numbers[0].replace(' ', '')
-
-                    # Check if user name appears in text
-                    name_found = user_name.lower() in text.lower()
-
-                    break  # Found Aadhaar, stop trying
+        # Fast path: the number is script-agnostic, so a digit-only English pass
+        # usually finds it. A mismatch here is only a hint: whitelisting digits
+        # makes Tesseract misread stray characters as numbers
+        languages_to_try = ['eng']
+        digits_numbers = []
+        try:
+            digits_text = ocr_image_to_string(image, 'eng', digits_only=True)
+            self._add("OCR_ATTEMPT_DIGITS", text_length=len(digits_text))
+            digits_numbers = [n.replace(' ', '') for n in _AADHAAR_NUMBER_RE.findall(digits_text)]
+        except Exception as e:
+            self._add("OCR_ATTEMPT_DIGITS", status="error", error=str(e))
+
+        # Number confirmed: one name-only pass with the preloaded English + Hindi
+        # model, skipping script detection. Otherwise one full pass in the
+        # detected script settles the number the digit pass missed or disagreed on
+        number_confirmed = user_aadhaar in digits_numbers
+        lang = 'eng+hin' if number_confirmed else self._detect_ocr_language(image)
+        languages_to_try.append(lang)
+        text_numbers = []
+        try:
+            text = ocr_image_to_string(image, lang)
+            self._add(f"OCR_ATTEMPT_{lang}", text_length=len(text))
+            if not number_confirmed:
+                text_numbers = [n.replace(' ', '') for n in _AADHAAR_NUMBER_RE.findall(text)]
+            name_found = user_name.casefold() in text.casefold()
+        except Exception as e:
+            self._add(f"OCR_ATTEMPT_{lang}", status="error", error=str(e))
 
-            except Exception as e:
-                self.verification_steps.append({
-                    "step": f"OCR_ATTEMPT_{lang}",
-                    "status": "error",
-                    "error": str(e)
-                })
-                continue
+        # Reject only when the full pass also fails to confirm the number
+        if number_confirmed or user_aadhaar in text_numbers:
+            aadhaar_found = user_aadhaar
+        else:
+            aadhaar_found = (text_numbers or digits_numbers or [None])[0]
 
         # Verify extracted data
         if aadhaar_found:
@@ -800,7 +1412,7 @@ class DocumentVerificationAgent:
                     "warning": "QR code not found. Verification based on OCR only. Please re-upload clear image with QR code for higher confidence.",
                     "name_matched": name_found,
                     "languages_tried": languages_to_try,
-                    "audit_trail": self.verification_steps
+                    "audit_trail": self._audit_trail()
                 }
             else:
                 return {
@@ -809,7 +1421,7 @@ class DocumentVerificationAgent:
                     "details": f"Expected: {user_aadhaar[-4:]}, Found: {aadhaar_found[-4:]}",
                     "security_alert": True,
                     "verification_method": "MULTILANG_OCR",
-                    "audit_trail": self.verification_steps
+                    "audit_trail": self._audit_trail()
                 }
 
         return {
@@ -818,9 +1430,52 @@ class DocumentVerificationAgent:
             "suggestion": "Please upload a clear, high-resolution image with visible text and QR code",
             "verification_method": "MULTILANG_OCR",
             "languages_tried": languages_to_try,
-            "audit_trail": self.verification_steps
+            "audit_trail": self._audit_trail()
         }
 
+    def _detect_ocr_language(self, image, script_languages: Optional[Dict[str, str]] = None) -> str:
+        """
+        Pick the Tesseract language from a cheap orientation/script detection pass
+        Falls back to English + Hindi (most common combination)
+        """
+        try:
+            osd = _pytesseract().image_to_osd(image, output_type=_pytesseract().Output.DICT)
+            lang = (script_languages or self.SCRIPT_LANGUAGES).get(osd.get("script"), 'eng+hin')
+        except Exception:
+            lang = 'eng+hin'
+
+        self._add("SCRIPT_DETECTION", language=lang)
+        return lang
+
+    def _certificate_ocr_text(
+        self,
+        file_path: str,
+        lang: Optional[str] = None,
+        gray: Optional[np.ndarray] = None
+    ) -> tuple:
+        """
+        (language, text) of a certificate scan, memoized per file content and language
+        lang=None detects the script first (see CERTIFICATE_SCRIPT_LANGUAGES).
+        """
+        key = (_file_digest(file_path), lang or "auto")
+        with _ocr_text_cache_lock:
+            cached = _ocr_text_cache.get(key)
+            if cached is not None:
+                _ocr_text_cache.move_to_end(key)
+                self._add("OCR_CACHE_HIT", language=cached[0])
+                return cached
+
+        image = load_certificate_for_ocr(file_path, gray)
+        if lang is None:
+            lang = self._detect_ocr_language(image, self.CERTIFICATE_SCRIPT_LANGUAGES)
+        result = (lang, ocr_image_to_string(image, lang))
+
+        with _ocr_text_cache_lock:
+            _ocr_text_cache[key] = result
+            if len(_ocr_text_cache) > OCR_TEXT_CACHE_SIZE:
+                _ocr_text_cache.popitem(last=False)
+        return result
+
     def verify_income_certificate(
         self,
         file_path: str,
@@ -829,60 +1484,33 @@ class DocumentVerificationAgent:
         """
         Verify income certificate with support for ALL 10 Indian languages + Transliteration
         """
-        try:
-            self.verification_steps = []
-            self.verification_steps.append({
-                "step": "INCOME_CERT_VERIFICATION",
-                "status": "started",
-                "timestamp": datetime.utcnow().isoformat()
-            })
-
-            image = Image.open(file_path)
-
-            # COMPREHENSIVE LANGUAGE SUPPORT
-            universal_lang = 'eng+hin+mar+tam+tel+kan+mal+ben+guj+pan'
+        try:
+            self._steps = []
+            self._add("INCOME_CERT_VERIFICATION", status="started", timestamp=True)
 
+            # One Tesseract pass with only the detected script's language packs
             try:
-                text = pytesseract.image_to_string(image, lang=universal_lang)
+                ocr_lang, text = self._certificate_ocr_text(file_path)
             except Exception:
-                print("⚠️ Full language pack not found, falling back to eng+hin")
-                try:
-                    text = pytesseract.image_to_string(image, lang='eng+hin')
-                    universal_lang = 'eng+hin (fallback)'
-                except:
-                     text = pytesseract.image_to_string(image, lang='eng')
-                     universal_lang = 'eng (fallback)'
-
-            text_lower = text.lower()
-
-            self.verification_steps.append({
-                "step": "OCR_EXTRACTION",
-                "language_mode": "universal_10_lang",
-                "used_lang_str": universal_lang,
-                "text_length": len(text)
-            })
-
-            # === UNIVERSAL KEYWORD DATABASE ===
-            keywords = {
-                'english': ['income', 'certificate', 'annual', 'year', 'government', 'tehsildar', 'revenue', 'valid', 'financial'],
-                'hindi': ['आय', 'प्रमाण', 'पत्र', 'वार्षिक', 'रुपये', 'तहसीलदार', 'शासन'],
-                'marathi': ['उत्पन्न', 'दाखला', 'प्रमाणपत्र', 'वार्षिक', 'वर्ष', 'तहसीलदार', 'शासन', 'महा', 'सेवा'],
-                'tamil': ['வருமானம்', 'சான்றிதழ்', 'ஆண்டு', 'வட்டாட்சியர்', 'அரசு'],
-                'telugu': ['ఆదాయ', 'ధృవీకరణ', 'పత్రం', 'సంవత్సర', 'తహసీల్దార్', 'ప్రభుత్వం'],
-                'kannada': ['ಆದಾಯ', 'ಪ್ರಮಾಣ', 'ಪತ್ರ', 'ವಾರ್ಷಿಕ', 'ತಹಶೀಲ್ದార్', 'ಸರ್ಕಾರ'],
-                'malayalam': ['വരുമാന', 'സർട്ടിഫിക്കറ്റ്', 'വാർഷിക', 'തഹസിൽദാർ', 'സർക്കാർ'],
-                'bengali': ['আয়ের', 'প্রশংসাপত্র', 'বাৎসরিক', 'রোজগার', 'তহশিলদার', 'সরকার'],
-                'gujarati': ['આવક', 'દાખલો', 'પ્રમાણપત્ર', 'વાર્ષિક', 'મામલતદાર', 'સરકાર'],
-                'punjabi': ['ਆਮਦਨ', 'ਸਰਟੀਫਿਕੇਟ', 'ਸਾਲਾਨਾ', 'ਤਹਿਸੀਲਦਾਰ', 'ਸਰਕਾਰ']
-            }
+                # Language pack not installed
+                _, text = self._certificate_ocr_text(file_path, 'eng')
+                ocr_lang = 'eng (fallback)'
+
+            text_lower = normalize_text(text)
 
-            all_keywords = [kw for lang_list in keywords.values() for kw in lang_list]
-            matches = sum(1 for kw in all_keywords if kw in text_lower)
+            self._add(
+                "OCR_EXTRACTION",
+                language_mode="script_detected",
+                used_lang_str=ocr_lang,
+                text_length=len(text)
+            )
 
-            matched_langs = []
-            for lang, kws in keywords.items():
-                if any(kw in text_lower for kw in kws):
-                    matched_langs.append(lang)
+            # Keywords in every supported language, found in a single pass over the text
+            found_keywords = find_keywords(_INCOME_KEYWORD_AUTOMATON, text_lower)
+            matches = sum(len(found_keywords & kws) for kws in INCOME_KEYWORDS.values())
+            matched_langs = [
+                lang for lang, kws in INCOME_KEYWORDS.items() if not found_keywords.isdisjoint(kws)
+            ]
 
             confidence = min((matches / 3) * 100, 95.0)
 
@@ -895,9 +1523,9 @@ class DocumentVerificationAgent:
             # 2. Generate name variations (Full Name)
             name_variations = []
             try:
-                name_variations = get_name_variations(user_name, target_langs)
+                name_variations = _cached_name_variations(user_name.lower(), tuple(sorted(target_langs)))
             except Exception as e:
-                print(f"Name variations error: {e}")
+                logger.debug("Name variations error: %s", e)
                 name_variations = [user_name.lower()]
 
             # 3. Check full name variations first
@@ -907,16 +1535,9 @@ class DocumentVerificationAgent:
             if not name_found:
                 user_parts = user_name.split()
                 if len(user_parts) > 0:
-                    part_matches = 0
-                    for part in user_parts:
-                        # Generate variations for this part (e.g. "Krishna" -> "कृष्णा")
-                        try:
-                            part_vars = get_name_variations(part, target_langs)
-                        except:
-                            part_vars = [part.lower()]
-
-                        if any(pv in text_lower for pv in part_vars):
-                            part_matches += 1
+                    # Variations for every part (e.g. "Krishna" -> "कृष्णा"), then one scan of the text
+                    part_vars_list = name_part_variations(user_parts, target_langs)
+                    part_matches = count_parts_found(part_vars_list, text_lower)
 
                     # Strict match: All parts must be present
                     if part_matches == len(user_parts):
@@ -925,12 +1546,12 @@ class DocumentVerificationAgent:
                     elif len(user_parts) >= 3 and part_matches >= len(user_parts) - 1:
                         name_found = True
 
-            self.verification_steps.append({
-                "step": "NAME_MATCHING_TRANSLITERATED",
-                "languages_checked": target_langs,
-                "variations_generated": len(name_variations),
-                "status": "match" if name_found else "mismatch"
-            })
+            self._add(
+                "NAME_MATCHING_TRANSLITERATED",
+                languages_checked=target_langs,
+                variations_generated=len(name_variations),
+                status="match" if name_found else "mismatch"
+            )
 
             result = {
                 "verified": confidence >= 25 and name_found,
@@ -940,7 +1561,7 @@ class DocumentVerificationAgent:
                 "keywords_matched": matches,
                 "name_matched": name_found,
                 "extracted_text_preview": text[:100].replace('', ' ') + "...",
-                "audit_trail": self.verification_steps
+                "audit_trail": self._audit_trail()
             }
 
             if not result["verified"]:
@@ -957,7 +1578,7 @@ class DocumentVerificationAgent:
             return {
                 "verified": False,
                 "error": str(e),
-                "audit_trail": self.verification_steps
+                "audit_trail": self._audit_trail()
             }
 
 
@@ -974,11 +1595,20 @@ class DocumentVerificationAgent:
         Verify caste certificate with regional language support + Transliteration + Caste Extraction
         """
         try:
-            self.verification_steps = []
-            image = cv2.imread(file_path)
-
-            # Step 1: Try QR extraction
-            qr_data = self._extract_qr_code(image)
+            self._steps = []
+            # Decoded once as grayscale; shared by the QR check and OCR
+            gray = _cv2().imread(file_path, _cv2().IMREAD_GRAYSCALE)
+
+            # Step 1: Try QR extraction (downscaled copy first, full resolution if that misses)
+            qr_data = None
+            if gray is not None:
+                scale = min(1.0, CERT_QR_MAX_EDGE / max(gray.shape[:2]))
+                if scale < 1.0:
+                    qr_data = self._extract_qr_code(
+                        _cv2().resize(gray, None, fx=scale, fy=scale, interpolation=_cv2().INTER_AREA)
+                    )
+                if not qr_data:
+                    qr_data = self._extract_qr_code(gray)
             if qr_data:
                 # Mock API Setu verification
                 api_result = self._mock_api_setu_verify(qr_data, "caste_certificate")
@@ -988,28 +1618,27 @@ class DocumentVerificationAgent:
                         "confidence": 85.0,
                         "verification_method": "QR_VALIDATION",
                         "note": "QR code validated (Mock API Setu for demo)",
-                        "audit_trail": self.verification_steps
+                        "audit_trail": self._audit_trail()
                     }
 
-            # Step 2: Multilingual OCR
-            return self._verify_caste_multilang_ocr(file_path, user_name, state)
+            # Step 2: Multilingual OCR on the already-decoded image
+            return self._verify_caste_multilang_ocr(file_path, user_name, state, gray=gray)
 
         except Exception as e:
             return {
                 "verified": False,
                 "error": str(e),
-                "audit_trail": self.verification_steps
+                "audit_trail": self._audit_trail()
             }
 
     def _verify_caste_multilang_ocr(
         self,
         file_path: str,
         user_name: str,
-        state: Optional[str] = None
+        state: Optional[str] = None,
+        gray: Optional[np.ndarray] = None
     ) -> Dict:
         """Verify caste certificate with multilingual OCR & Transliteration"""
-        image = Image.open(file_path)
-
         # Determine language based on state (if provided)
         lang_map = {
             'tamil nadu': 'eng+tam',
@@ -1026,18 +1655,13 @@ class DocumentVerificationAgent:
         lang = lang_map.get(state.lower() if state else '', 'eng+hin')
 
         try:
-            text = pytesseract.image_to_string(image, lang=lang)
-            text_lower = text.lower()
-
-            # Keywords in multiple languages
-            english_keywords = ['caste', 'certificate', 'scheduled caste', 'scheduled tribe', 'sc', 'st', 'government', 'community']
-            hindi_keywords = ['जाति', 'प्रमाण', 'अनुसूचित', 'सरकार', 'समुदाय']
-            marathi_keywords = ['जात', 'प्रमाणपत्र', 'जमात', 'अनुसूचित']
+            _, text = self._certificate_ocr_text(file_path, lang, gray)
+            text_lower = normalize_text(text)
 
-            all_keywords = english_keywords + hindi_keywords + marathi_keywords
-
-            matches = sum(1 for kw in all_keywords if kw in text_lower)
-            confidence = min((matches / len(english_keywords)) * 100, 95.0)
+            # Keywords in multiple languages, found in a single pass over the text
+            found_keywords = find_keywords(_CASTE_KEYWORD_AUTOMATON, text_lower)
+            matches = sum(1 for kw in CASTE_KEYWORDS if kw in found_keywords)
+            confidence = min((matches / len(CASTE_ENGLISH_KEYWORDS)) * 100, 95.0)
 
             # === ENHANCED NAME MATCHING (Transliteration) ===
             # Determine target languages for transliteration
@@ -1054,26 +1678,22 @@ class DocumentVerificationAgent:
 
             if not target_langs: target_langs = ['hindi', 'marathi']
 
+            # Name invariants, computed once
+            name_lower = user_name.lower()
+            user_parts = user_name.split()
+
             try:
-                name_variations = get_name_variations(user_name, target_langs)
+                name_variations = _cached_name_variations(name_lower, tuple(sorted(target_langs)))
             except:
-                name_variations = [user_name.lower()]
+                name_variations = [name_lower]
 
-            name_found = any(name_var in text_lower for name_var in name_variations)
+            name_found = contains_any(name_variations, text_lower)
 
             # Fallback: Part-by-part matching
             if not name_found:
-                user_parts = user_name.split()
                 if len(user_parts) > 1:
-                    part_matches = 0
-                    for part in user_parts:
-                        try:
-                            part_vars = get_name_variations(part, target_langs)
-                        except:
-                            part_vars = [part.lower()]
-
-                        if any(pv in text_lower for pv in part_vars):
-                            part_matches += 1
+                    part_vars_list = name_part_variations(user_parts, target_langs)
+                    part_matches = count_parts_found(part_vars_list, text_lower)
 
                     if part_matches == len(user_parts) or (len(user_parts) > 2 and part_matches >= len(user_parts) - 1):
                         name_found = True
@@ -1101,7 +1721,7 @@ class DocumentVerificationAgent:
                     "warning": "Medium confidence. Document validated but please upload with QR code for government registry verification.",
                     "name_matched": name_found,
                     "keywords_matched": matches,
-                    "audit_trail": self.verification_steps
+                    "audit_trail": self._audit_trail()
                 }
 
             return {
@@ -1112,14 +1732,14 @@ class DocumentVerificationAgent:
                 "extracted_caste": extracted_caste,
                 "suggestion": "Ensure document is clear and contains all required elements",
                 "language_used": lang,
-                "audit_trail": self.verification_steps
+                "audit_trail": self._audit_trail()
             }
 
         except Exception as e:
             return {
                 "verified": False,
                 "error": str(e),
-                "audit_trail": self.verification_steps
+                "audit_trail": self._audit_trail()
             }
 
 
@@ -1147,11 +1767,7 @@ class DocumentVerificationAgent:
         Mock API Setu verification for demo
         In production: Replace with actual API call
         """
-        self.verification_steps.append({
-            "step": "MOCK_API_SETU_CALL",
-            "doc_type": doc_type,
-            "note": "Demo mode - using mock validation"
-        })
+        self._add("MOCK_API_SETU_CALL", doc_type=doc_type, note="Demo mode - using mock validation")
 
         # Simple validation: QR should have certificate-related keywords
         if len(qr_data) > 50:
@@ -1165,22 +1781,155 @@ class DocumentVerificationAgent:
 
     def _fuzzy_match(self, str1: str, str2: str) -> float:
         """Calculate string similarity (0-1)"""
-        return SequenceMatcher(None, str1, str2).ratio()
+        return fuzz.ratio(str1, str2) / 100.0
+
+
+# ==================== OCR WORKER POOL ====================
+
+# Aadhaar QR/OCR runs in pre-warmed worker processes: true CPU parallelism across
+# requests, and each worker keeps its detectors and Tesseract setup between calls
+# Every uvicorn worker process owns its own pool, so split the cores between them
+# (run.py exports WORKERS) instead of giving each one cpu_count OCR processes
+OCR_WORKERS = int(os.getenv(
+    "OCR_WORKERS",
+    max(1, (os.cpu_count() or 1) // max(1, int(os.getenv("WORKERS", 1))))
+))
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+_worker_agent = None
+# (lang, digits_only) Tesseract APIs each worker opens at startup
+OCR_PRELOAD_APIS = (('eng', True), ('eng', False), ('eng+hin', False))
+
+
+def _init_ocr_worker():
+    """Warm a worker process once instead of on every verification"""
+    global _worker_agent
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    _worker_agent = DocumentVerificationAgent()
+    _cv2().setNumThreads(1)
+    try:
+        if tesserocr is not None:
+            # Load the traineddata the Aadhaar fallback always starts with
+            for lang, digits_only in OCR_PRELOAD_APIS:
+                with _tess_api(lang, digits_only):
+                    pass
+        else:
+            _pytesseract().get_tesseract_version()
+    except Exception:
+        pass  # Tesseract missing; OCR fallback reports the error per request
+
+
+def get_ocr_pool() -> ProcessPoolExecutor:
+    """Create the OCR worker pool on first use"""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            # spawn, not fork: forked children would inherit the parent's dead thread pools
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=OCR_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ocr_worker
+            )
+    return _ocr_pool
+
+
+def _replace_broken_ocr_pool(broken: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died (segfault, OOM kill) so the next call builds a fresh one"""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is broken:
+            _ocr_pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def submit_to_ocr_pool(fn, *args):
+    """Run fn in the OCR pool; rebuild the pool and retry once if it has broken"""
+    for attempt in range(2):
+        pool = get_ocr_pool()
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            logger.warning("OCR worker pool broken; restarting it (attempt %d)", attempt + 1)
+            _replace_broken_ocr_pool(pool)
+            if attempt:
+                raise
 
 
-# Initialize verification agent
-_verification_agent = DocumentVerificationAgent()
+def _verify_aadhaar_in_worker(
+    file_path: str,
+    user_aadhaar: str,
+    user_name: str,
+    file_bytes: Optional[bytes] = None
+) -> Dict:
+    """Entry point executed inside an OCR worker process"""
+    if file_bytes is not None:
+        return _worker_agent.verify_aadhaar_card_bytes(
+            file_bytes,
+            os.path.splitext(file_path)[1].lower(),
+            user_aadhaar,
+            user_name
+        )
+    return _worker_agent.verify_aadhaar_card(
+        file_path=file_path,
+        user_aadhaar=user_aadhaar,
+        user_name=user_name
+    )
 
 
 # ==================== PASSWORD FUNCTIONS ====================
 
 def hash_password(password: str) -> str:
     """Hash a plain password using bcrypt"""
-    return pwd_context.hash(password)
+    secret = password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+    return bcrypt.hashpw(secret, bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
+
+# Recently successful password checks: keyed digest -> unix time the entry stops being valid.
+# Keys are BLAKE2b digests under a random per-process pepper, so the cache never holds a
+# plaintext or anything that can be brute-forced offline (even if SECRET_KEY leaks).
+PASSWORD_CACHE_TTL_SECONDS = 60
+PASSWORD_CACHE_SIZE = 10000
+_password_cache: "OrderedDict[bytes, float]" = OrderedDict()
+_password_cache_lock = threading.Lock()
+_PASSWORD_CACHE_PEPPER = secrets.token_bytes(32)
+
+def _password_cache_key(secret: bytes, hashed: bytes) -> bytes:
+    """Keyed digest of (password, stored hash); changes whenever the hash is rotated"""
+    return hashlib.blake2b(secret + b"\0" + hashed, key=_PASSWORD_CACHE_PEPPER).digest()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against hashed password"""
-    return pwd_context.verify(plain_password, hashed_password)
+    secret = plain_password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+    hashed = hashed_password.encode("utf-8")
+    key = _password_cache_key(secret, hashed)
+    now = time.time()
+    with _password_cache_lock:
+        valid_until = _password_cache.get(key)
+        if valid_until is not None:
+            if now < valid_until:
+                return True
+            del _password_cache[key]
+
+    try:
+        ok = bcrypt.checkpw(secret, hashed)
+    except ValueError:
+        return False  # Malformed hash
+
+    # Only successes are cached; failed guesses always pay the full bcrypt cost
+    if ok:
+        with _password_cache_lock:
+            _password_cache[key] = now + PASSWORD_CACHE_TTL_SECONDS
+            if len(_password_cache) > PASSWORD_CACHE_SIZE:
+                _password_cache.popitem(last=False)
+    return ok
+
+_dummy_password_hash = None
+
+def _burn_password_check(password: str) -> None:
+    """Spend the same bcrypt time as a real check so unknown emails can't be told apart by timing"""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = hash_password("dummy-password")
+    verify_password(password, _dummy_password_hash)
 
 
 # ==================== JWT TOKEN FUNCTIONS ====================
@@ -1197,25 +1946,53 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         "exp": expire,
         "iat": datetime.utcnow()
     })
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Recently verified tokens: token -> (payload, unix time the entry stops being valid)
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_SIZE = 10000
+_token_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
 def verify_token(token: str) -> Optional[dict]:
     """Verify and decode JWT token with detailed error logging"""
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+        if cached is not None:
+            payload, valid_until = cached
+            if now < valid_until:
+                return dict(payload)
+            del _token_cache[token]
+
     try:
-        print(f"🔍 Verifying token...")
         # Verify the token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        print(f"✅ Token decoded successfully. Sub: {payload.get('sub')}")
+        payload = jwt.decode(
+            token, _SECRET_KEY_BYTES, algorithms=[ALGORITHM], options={"require": ["exp", "iat"]}
+        )
+        logger.debug("Token decoded successfully. sub=%s", payload.get('sub'))
+
+        # Never let a cache entry outlive the token itself
+        valid_until = now + TOKEN_CACHE_TTL_SECONDS
+        if "exp" in payload:
+            valid_until = min(valid_until, float(payload["exp"]))
+        with _token_cache_lock:
+            _token_cache[token] = (dict(payload), valid_until)
+            if len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+
         return payload
     except ExpiredSignatureError:
-        print("❌ Token verification failed: Token has expired")
+        logger.debug("Token verification failed: token has expired")
+        with _token_cache_lock:
+            _token_cache.pop(token, None)
         return None
     except JWTError as e:
-        print(f"❌ Token verification failed: {str(e)}")
+        logger.debug("Token verification failed: %s", e)
         return None
     except Exception as e:
-        print(f"❌ Unexpected error: {type(e).__name__} - {str(e)}")
+        logger.warning("Unexpected token verification error: %s - %s", type(e).__name__, e)
         return None
 
 
@@ -1251,7 +2028,7 @@ def create_user(
     db.commit()
     db.refresh(db_user)
 
-    print(f"✅ User created: {email} (ID: {db_user.id})")
+    logger.debug("User created: %s (ID: %s)", email, db_user.id)
     return db_user
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
@@ -1259,18 +2036,19 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = db.query(User).filter(User.email == email).first()
 
     if not user:
-        print(f"❌ Authentication failed: User not found - {email}")
+        _burn_password_check(password)
+        logger.debug("Authentication failed: user not found - %s", email)
         return None
 
     if not user.is_active:
-        print(f"❌ Authentication failed: User inactive - {email}")
+        logger.debug("Authentication failed: user inactive - %s", email)
         return None
 
     if not verify_password(password, user.hashed_password):
-        print(f"❌ Authentication failed: Wrong password - {email}")
+        logger.debug("Authentication failed: wrong password - %s", email)
         return None
 
-    print(f"✅ Authentication successful: {email}")
+    logger.debug("Authentication successful: %s", email)
     return user
 
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
@@ -1298,10 +2076,215 @@ def update_user(db: Session, user_id: int, **kwargs) -> Optional[User]:
 
 # ==================== ENHANCED DOCUMENT VERIFICATION ====================
 
+# Results of recent verifications keyed by (file hash, user details, document type),
+# so re-uploading the same file skips QR/OCR entirely
+VERIFICATION_CACHE_SIZE = 1024
+_verification_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+_verification_cache_lock = threading.Lock()
+
+# On-disk caches hold Aadhaar numbers, names and OCR'd document text, so they live
+# in an app-owned directory (0700, files 0600) rather than the shared temp dir
+APP_CACHE_DIR = os.getenv(
+    "FAIRCLAIM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "fairclaim")
+)
+
+
+def _ensure_private_dir(path: str) -> None:
+    """Create a cache directory readable only by this user (tightening it if it already exists)"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    os.chmod(path, 0o700)
+
+
+def _write_private_file(path: str, data: str) -> None:
+    """Write a 0600 file via temp file + rename so readers never see partial content"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Second tier on disk, so re-uploads hit across restarts and worker processes
+VERIFICATION_CACHE_DIR = os.getenv(
+    "VERIFICATION_CACHE_DIR", os.path.join(APP_CACHE_DIR, "verifications")
+)
+VERIFICATION_CACHE_TTL_SECONDS = 24 * 3600
+
+
+def _verification_disk_path(key: tuple) -> str:
+    """Cache file for a verification key (the key itself holds personal data, so it's hashed)"""
+    digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(VERIFICATION_CACHE_DIR, digest + ".json")
+
+
+def _verification_disk_get(key: tuple) -> Optional[Dict]:
+    """Cached result from disk, or None if missing, unreadable or older than the TTL"""
+    path = _verification_disk_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > VERIFICATION_CACHE_TTL_SECONDS:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _verification_disk_put(key: tuple, result: Dict) -> None:
+    """Persist a result (temp file + rename so readers never see partial JSON)"""
+    path = _verification_disk_path(key)
+    try:
+        _ensure_private_dir(VERIFICATION_CACHE_DIR)
+        _write_private_file(path, json.dumps(result, default=str))
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Verification cache write failed: %s", e)
+
+
+def _is_conclusive(result: Dict) -> bool:
+    """
+    True when a result is safe to replay for the same file: not an error, not a
+    "please re-upload" outcome, and no OCR/QR step failed along the way (a
+    Tesseract crash can still end in a plain "Unable to extract" rejection)
+    """
+    if "error" in result or "suggestion" in result:
+        return False
+    return not any(
+        isinstance(step, dict) and step.get("status") == "error"
+        for step in result.get("audit_trail") or ()
+    )
+
+
+def _mark_cache_hit(result: Dict, source: str) -> Dict:
+    """Note the cache hit in the audit trail of a result being replayed"""
+    if isinstance(result.get("audit_trail"), list):
+        result["audit_trail"].append({
+            "step": "VERIFICATION_CACHE_HIT",
+            "timestamp": datetime.utcnow().isoformat(),
+            "source": source
+        })
+    return result
+
+
+def _file_digest(file_path: str, file_bytes: Optional[bytes] = None) -> str:
+    """Content hash of an uploaded file"""
+    if file_bytes is None:
+        with open(file_path, "rb") as f:
+            file_bytes = f.read()
+    return hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+
+
 def verify_document_with_ocr(
     file_path: str,
     document_type: str,
-    user: User
+    user: User,
+    file_bytes: Optional[bytes] = None
+) -> Dict:
+    """
+    Verify a document, reusing the previous result when the same user
+    uploads a byte-identical file for the same document type
+
+    Pass file_bytes when the upload is already in memory to skip re-reading it.
+    """
+    key = (
+        _file_digest(file_path, file_bytes), document_type,
+        user.aadhaar_number, user.full_name, user.address
+    )
+
+    with _verification_cache_lock:
+        cached = _verification_cache.get(key)
+        if cached is not None:
+            _verification_cache.move_to_end(key)
+            return _mark_cache_hit(copy.deepcopy(cached), "memory")
+
+    result = _verification_disk_get(key)
+    if result is not None:
+        with _verification_cache_lock:
+            _verification_cache[key] = copy.deepcopy(result)
+            if len(_verification_cache) > VERIFICATION_CACHE_SIZE:
+                _verification_cache.popitem(last=False)
+        return _mark_cache_hit(result, "disk")
+
+    result = _verify_document_uncached(file_path, document_type, user, file_bytes)
+
+    # Only remember conclusive results; errors and unreadable scans may be transient
+    if _is_conclusive(result):
+        with _verification_cache_lock:
+            _verification_cache[key] = copy.deepcopy(result)
+            if len(_verification_cache) > VERIFICATION_CACHE_SIZE:
+                _verification_cache.popitem(last=False)
+        _verification_disk_put(key, result)
+
+    return result
+
+
+# Bounded pool for blocking verification work so async routes never stall the event loop
+_VERIFY_EXECUTOR = ThreadPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) // 2))
+
+
+async def verify_document_with_ocr_async(
+    file_path: str,
+    document_type: str,
+    user: User,
+    file_bytes: Optional[bytes] = None
+) -> Dict:
+    """Awaitable verify_document_with_ocr that runs on the verification thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _VERIFY_EXECUTOR, verify_document_with_ocr, file_path, document_type, user, file_bytes
+    )
+
+
+async def verify_document_batch_async(file_paths: List[str], document_type: str, user: User) -> List[Dict]:
+    """
+    Awaitable verify_document_batch
+
+    FIR copies are one job (a single batched Tesseract run); other types make
+    each file its own job on the verification thread pool, so a batch shares
+    the pool's concurrency limit instead of nesting a pool of its own
+    """
+    if document_type == "fir_copy":
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _VERIFY_EXECUTOR, verify_document_batch, file_paths, document_type, user
+        )
+    return list(await asyncio.gather(
+        *(verify_document_with_ocr_async(path, document_type, user) for path in file_paths)
+    ))
+
+
+# Indian states and union territories, for picking the state out of a free-form address
+_STATE_PATTERN = re.compile(
+    r"\b(Andhra Pradesh|Arunachal Pradesh|Assam|Bihar|Chhattisgarh|Goa|Gujarat|Haryana|"
+    r"Himachal Pradesh|Jharkhand|Karnataka|Kerala|Madhya Pradesh|Maharashtra|Manipur|"
+    r"Meghalaya|Mizoram|Nagaland|Odisha|Orissa|Punjab|Rajasthan|Sikkim|Tamil Nadu|Telangana|"
+    r"Tripura|Uttar Pradesh|Uttarakhand|West Bengal|Andaman and Nicobar Islands|Chandigarh|"
+    r"Dadra and Nagar Haveli and Daman and Diu|Delhi|Jammu and Kashmir|Ladakh|Lakshadweep|"
+    r"Puducherry|Pondicherry)\b",
+    re.IGNORECASE
+)
+
+
+def _extract_state(address: Optional[str]) -> Optional[str]:
+    """State named in an address, else its last comma-separated part"""
+    if not address:
+        return None
+    match = _STATE_PATTERN.search(address)
+    if match:
+        return match.group(1).title()
+    return address.rsplit(',', 1)[-1].strip() or None
+
+
+def _verify_document_uncached(
+    file_path: str,
+    document_type: str,
+    user: User,
+    file_bytes: Optional[bytes] = None
 ) -> Dict:
     """
     Enhanced multilingual document verification with user cross-check
@@ -1325,34 +2308,33 @@ def verify_document_with_ocr(
                     "suggestion": "Please update your profile with Aadhaar number first"
                 }
 
-            return _verification_agent.verify_aadhaar_card(
-                file_path=file_path,
-                user_aadhaar=user.aadhaar_number,
-                user_name=user.full_name
+            return submit_to_ocr_pool(
+                _verify_aadhaar_in_worker,
+                file_path,
+                user.aadhaar_number,
+                user.full_name,
+                file_bytes
             )
 
         elif document_type == "caste_certificate":
             # Extract state from address if available
-            state = None
-            if user.address:
-                # Try to extract state from address (last part usually)
-                address_parts = user.address.split(',')
-                if address_parts:
-                    state = address_parts[-1].strip()
-
-            return _verification_agent.verify_caste_certificate(
+            state = _extract_state(user.address)
+
+            # A fresh agent per call: the audit trail lives on the instance and
+            # verifications run concurrently on _VERIFY_EXECUTOR
+            return DocumentVerificationAgent().verify_caste_certificate(
                 file_path=file_path,
                 user_name=user.full_name,
                 state=state
             )
 
         elif document_type == "income_certificate":
-            return _verification_agent.verify_income_certificate(
+            return DocumentVerificationAgent().verify_income_certificate(
                 file_path=file_path,
                 user_name=user.full_name
             )
         elif document_type == "fir_copy":
-            return _verify_document_basic_ocr(file_path, document_type, user.full_name)
+            return _verify_document_basic_ocr(file_path, document_type, user.full_name, file_bytes)
 
         else:
             return {
@@ -1367,39 +2349,223 @@ def verify_document_with_ocr(
             "security_alert": True
         }
 
-def _verify_document_basic_ocr(file_path: str, document_type: str, user_name: str) -> Dict:
+# Extracted OCR text keyed by file content hash (survives restarts, shared by workers).
+# The text is victim PII: private directory, bounded age and entry count
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", os.path.join(APP_CACHE_DIR, "ocr"))
+OCR_CACHE_TTL_SECONDS = int(os.getenv("OCR_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", 5000))
+OCR_CACHE_SWEEP_INTERVAL_SECONDS = 600
+_ocr_cache_last_sweep = 0.0
+_ocr_cache_sweep_lock = threading.Lock()
+
+
+def _sweep_ocr_cache() -> None:
+    """Delete expired entries, then the oldest beyond the size cap (at most once per interval)"""
+    global _ocr_cache_last_sweep
+    now = time.time()
+    if now - _ocr_cache_last_sweep < OCR_CACHE_SWEEP_INTERVAL_SECONDS:
+        return
+    if not _ocr_cache_sweep_lock.acquire(blocking=False):
+        return  # Another thread is already sweeping
+    try:
+        _ocr_cache_last_sweep = now
+        entries = []
+        with os.scandir(OCR_CACHE_DIR) as it:
+            for entry in it:
+                if not entry.name.endswith(".txt"):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if now - mtime > OCR_CACHE_TTL_SECONDS:
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+                else:
+                    entries.append((mtime, entry.path))
+        if len(entries) > OCR_CACHE_MAX_ENTRIES:
+            entries.sort()
+            for _, path in entries[:len(entries) - OCR_CACHE_MAX_ENTRIES]:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+    except OSError as e:
+        logger.debug("OCR cache sweep failed: %s", e)
+    finally:
+        _ocr_cache_sweep_lock.release()
+
+
+def _ocr_cache_get(cache_path: str) -> Optional[str]:
+    """Cached OCR text, or None if missing or expired"""
+    try:
+        if time.time() - os.path.getmtime(cache_path) <= OCR_CACHE_TTL_SECONDS:
+            with open(cache_path, encoding="utf-8") as f:
+                return f.read()
+    except OSError:
+        pass
+    return None
+
+
+def _ocr_cache_put(cache_path: str, text: str) -> None:
+    try:
+        _ensure_private_dir(OCR_CACHE_DIR)
+        _write_private_file(cache_path, text)
+    except OSError as e:
+        logger.debug("OCR cache write failed: %s", e)
+    _sweep_ocr_cache()
+
+
+def _cached_ocr(file_path: str, file_bytes: Optional[bytes] = None) -> str:
+    """English OCR of a document, reusing the text from any earlier run on identical bytes"""
+    if file_bytes is None:
+        with open(file_path, "rb") as f:
+            file_bytes = f.read()
+    cache_path = os.path.join(OCR_CACHE_DIR, _file_digest(file_path, file_bytes) + ".txt")
+
+    text = _ocr_cache_get(cache_path)
+    if text is not None:
+        return text
+
+    if file_bytes.startswith(b"%PDF"):
+        # Tesseract can't read PDFs; OCR the rendered first page instead
+        image = render_pdf_to_image(file_bytes)
+        text = ocr_image_to_string(prepare_image_for_ocr(image) if OCR_PREPROCESS else image, 'eng')
+    elif OCR_PREPROCESS:
+        with Image.open(io.BytesIO(file_bytes)) as image:
+            text = ocr_image_to_string(prepare_image_for_ocr(image), 'eng')
+    else:
+        text = ocr_image_file(file_path, 'eng')
+
+    _ocr_cache_put(cache_path, text)
+    return text
+
+
+def _cached_ocr_batch(file_paths: List[str]) -> List[str]:
+    """
+    English OCR of many documents, same preprocessing and cache as _cached_ocr
+    Cache misses are read together by ocr_image_files_batch
+    """
+    texts = []
+    cache_paths = []
+    misses = []
+    for i, file_path in enumerate(file_paths):
+        with open(file_path, "rb") as f:
+            file_bytes = f.read()
+        cache_path = os.path.join(OCR_CACHE_DIR, _file_digest(file_path, file_bytes) + ".txt")
+        cache_paths.append(cache_path)
+        texts.append(_ocr_cache_get(cache_path))
+        if texts[i] is None:
+            misses.append((i, file_path, file_bytes))
+
+    if not misses:
+        return texts
+
+    # Preprocessed pages go through a private temp dir, since Tesseract reads the list from disk
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ocr_paths = []
+        for i, file_path, file_bytes in misses:
+            if file_bytes.startswith(b"%PDF"):
+                image = render_pdf_to_image(file_bytes)
+            elif OCR_PREPROCESS:
+                image = Image.open(io.BytesIO(file_bytes))
+            else:
+                ocr_paths.append(file_path)
+                continue
+            page_path = os.path.join(tmp_dir, f"{i}.png")
+            with image:
+                prepare_image_for_ocr(image).save(page_path, compress_level=1)
+            ocr_paths.append(page_path)
+        batch_texts = ocr_image_files_batch(ocr_paths)
+
+    for (i, _, _), text in zip(misses, batch_texts):
+        texts[i] = text
+        _ocr_cache_put(cache_paths[i], text)
+    return texts
+
+
+def _verify_document_basic_ocr(
+    file_path: str,
+    document_type: str,
+    user_name: str,
+    file_bytes: Optional[bytes] = None
+) -> Dict:
     """
     Basic OCR verification for income_certificate and fir_copy
     (Fallback method - to be enhanced later)
     """
     try:
-        image = Image.open(file_path)
-        extracted_text = pytesseract.image_to_string(image)
-        text_lower = extracted_text.lower()
-
-        # Define keywords for different document types
-        keywords_map = {
-            "income_certificate": [
-                "income", "certificate", "annual income", "government", "revenue",
-                "district", "magistrate", "financial year"
-            ],
-            "fir_copy": [
-                "fir", "first information report", "police station", "complaint",
-                "case", "section", "ipc", "accused"
-            ]
+        extracted_text = _cached_ocr(file_path, file_bytes)
+        return _score_basic_ocr(extracted_text, document_type, user_name)
+
+    except Exception as e:
+        return {
+            "verified": False,
+            "error": str(e),
+            "confidence": 0.0
         }
 
-        required_keywords = keywords_map.get(document_type, [])
-        matches = sum(1 for keyword in required_keywords if keyword in text_lower)
-        total_keywords = len(required_keywords)
-        confidence = (matches / total_keywords) * 100 if total_keywords > 0 else 0
 
-        name_found = user_name.lower() in text_lower
+# Keywords for different document types
+BASIC_OCR_KEYWORDS = {
+    "income_certificate": [
+        "income", "certificate", "annual income", "government", "revenue",
+        "district", "magistrate", "financial year"
+    ],
+    "fir_copy": [
+        "fir", "first information report", "police station", "complaint",
+        "case", "section", "ipc", "accused"
+    ]
+}
+
+
+def _build_basic_ocr_scorer(document_type: str, keywords: List[str]):
+    """
+    Specialise keyword + name scoring for one document type
+
+    The keyword set, its size, and (without pyahocorasick) the encoded
+    keywords are fixed here once; only the name part varies per call.
+    """
+    keyword_set = frozenset(keywords)
+    total_keywords = len(keywords)
+    keyword_bytes = build_keyword_automaton(keywords) if ahocorasick is None else ()
+
+    @functools.lru_cache(maxsize=256)
+    def automaton_for(name_lower: str) -> "ahocorasick.Automaton":
+        # Keywords and name tokens in one automaton; values are (is_keyword, is_name_token, word)
+        name_tokens = set(name_lower.split())
+        automaton = ahocorasick.Automaton()
+        for word in keyword_set | name_tokens:
+            automaton.add_word(word, (word in keyword_set, word in name_tokens, word))
+        automaton.make_automaton()
+        return automaton
+
+    def score(extracted_text: str, user_name: str) -> Dict:
+        text_lower = normalize_text(extracted_text)
+        name_lower = user_name.lower()
+        name_tokens = name_lower.split()
+
+        found_keywords, found_name_tokens = set(), set()
+        if ahocorasick is None:
+            found_keywords = find_keywords(keyword_bytes, text_lower)
+            found_name_tokens = find_keywords(build_keyword_automaton(name_tokens), text_lower)
+        else:
+            for _, (is_keyword, is_name_token, word) in automaton_for(name_lower).iter(text_lower):
+                if is_keyword:
+                    found_keywords.add(word)
+                if is_name_token:
+                    found_name_tokens.add(word)
+
+        matches = len(found_keywords)
+        confidence = (matches / total_keywords) * 100 if total_keywords > 0 else 0
 
-        verified = confidence >= 40 and name_found
+        # OCR often splits or drops part of a name, so allow one missing token
+        name_found = bool(name_tokens) and len(found_name_tokens) >= max(1, len(set(name_tokens)) - 1)
 
         return {
-            "verified": verified,
+            "verified": confidence >= 40 and name_found,
             "confidence": round(confidence, 2),
             "verification_method": "BASIC_OCR",
             "extracted_text_preview": extracted_text[:200],
@@ -1409,6 +2575,28 @@ def _verify_document_basic_ocr(file_path: str, document_type: str, user_name: st
             "note": "Basic verification. Enhanced multi-language support coming soon."
         }
 
+    return score
+
+
+# One specialised scorer per document type; adding a type only needs a BASIC_OCR_KEYWORDS entry
+_BASIC_OCR_SCORERS = {
+    doc_type: _build_basic_ocr_scorer(doc_type, keywords)
+    for doc_type, keywords in BASIC_OCR_KEYWORDS.items()
+}
+
+
+def _score_basic_ocr(extracted_text: str, document_type: str, user_name: str) -> Dict:
+    """Keyword + name scoring shared by single and batch basic OCR"""
+    scorer = _BASIC_OCR_SCORERS.get(document_type)
+    if scorer is None:
+        return {
+            "verified": False,
+            "error": f"Unsupported document type: {document_type}",
+            "confidence": 0.0
+        }
+
+    try:
+        return scorer(extracted_text, user_name)
     except Exception as e:
         return {
             "verified": False,
@@ -1417,31 +2605,69 @@ def _verify_document_basic_ocr(file_path: str, document_type: str, user_name: st
         }
 
 
+def verify_document_batch(file_paths: List[str], document_type: str, user: User) -> List[Dict]:
+    """
+    Verify several documents of one type for the same user
+
+    FIR copies missing from the OCR cache are read by one batched Tesseract
+    run; other types go through verify_document_with_ocr file by file. Use
+    verify_document_batch_async to verify those concurrently.
+    """
+    if document_type == "fir_copy":
+        try:
+            texts = _cached_ocr_batch(file_paths)
+        except Exception as e:
+            return [{"verified": False, "error": str(e), "confidence": 0.0} for _ in file_paths]
+        return [_score_basic_ocr(text, document_type, user.full_name) for text in texts]
+
+    return [verify_document_with_ocr(path, document_type, user) for path in file_paths]
+
+
 # ==================== SMS NOTIFICATION SERVICE ====================
 
+# One Twilio client per process so its HTTP session (and TLS connection) is reused
+_twilio_client = None
+_twilio_client_lock = threading.Lock()
+
+
+def _get_twilio_client() -> "Client":
+    """Lazily create the shared Twilio client (twilio is only imported when SMS is really sent)"""
+    global _twilio_client
+    if _twilio_client is None:
+        with _twilio_client_lock:
+            if _twilio_client is None:
+                from twilio.rest import Client
+                _twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+    return _twilio_client
+
+
+# Fixed fields of a simulated (Twilio not configured) send
+_SIMULATED_SMS_RESPONSE = {
+    "success": True,
+    "status": "simulated",
+    "note": "SMS would be sent in production"
+}
+
+
 def send_sms(to_phone: str, message: str) -> Dict:
     """Send SMS notification via Twilio using Messaging Service"""
     try:
-        if not all([TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_MESSAGING_SERVICE_SID]):
-            print("⚠️ Twilio not configured. SMS simulation mode.")
+        if not TWILIO_ENABLED:
+            logger.info("Twilio not configured. SMS simulation mode.")
             return {
-                "success": True,
-                "message_sid": "SIMULATED_SID_" + str(hash(to_phone))[-6:],
-                "status": "simulated",
-                "note": "SMS would be sent in production",
+                **_SIMULATED_SMS_RESPONSE,
+                "message_sid": "SIMULATED_SID_" + uuid.uuid4().hex[:6],
                 "to": to_phone,
                 "message_preview": message[:50] + "..."
             }
 
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-
-        sms = client.messages.create(
+        sms = _get_twilio_client().messages.create(
             body=message,
             messaging_service_sid=TWILIO_MESSAGING_SERVICE_SID,
             to=to_phone
         )
 
-        print(f"✅ SMS sent to {to_phone}: {message[:50]}...")
+        logger.info("SMS sent to %s: %s...", to_phone, message[:50])
         return {
             "success": True,
             "message_sid": sms.sid,
@@ -1452,7 +2678,62 @@ def send_sms(to_phone: str, message: str) -> Dict:
 
     except Exception as e:
         error_msg = f"SMS sending failed: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.warning(error_msg)
+        return {
+            "success": False,
+            "error": error_msg,
+            "to": to_phone,
+            "note": "Check Twilio credentials and phone number format"
+        }
+
+# Background senders so notifications never hold up the request that triggered them
+_SMS_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sms")
+
+
+def _log_background_sms(future) -> None:
+    """Surface failures of queued sends, which have no caller left to inspect them"""
+    try:
+        result = future.result()
+    except Exception as e:
+        logger.warning("Background SMS crashed: %s", e)
+        return
+    if not result.get("success"):
+        logger.warning("Background SMS to %s failed: %s", result.get("to"), result.get("error"))
+
+
+def send_sms_background(to_phone: str, message: str) -> Dict:
+    """Queue an SMS on the background pool and return immediately"""
+    future = _SMS_EXECUTOR.submit(send_sms, to_phone, message)
+    future.add_done_callback(_log_background_sms)
+    return {"success": True, "queued": True, "future_id": id(future), "to": to_phone}
+
+
+async def send_sms_async(client: httpx.AsyncClient, to_phone: str, message: str) -> Dict:
+    """Send one SMS through Twilio's REST API on a shared async client"""
+    try:
+        response = await client.post(
+            TWILIO_MESSAGES_URL.format(sid=TWILIO_ACCOUNT_SID),
+            data={
+                "To": to_phone,
+                "MessagingServiceSid": TWILIO_MESSAGING_SERVICE_SID,
+                "Body": message
+            }
+        )
+        response.raise_for_status()
+        sms = response.json()
+
+        logger.info("SMS sent to %s: %s...", to_phone, message[:50])
+        return {
+            "success": True,
+            "message_sid": sms.get("sid"),
+            "status": sms.get("status"),
+            "to": to_phone,
+            "delivery_status": "queued"
+        }
+
+    except Exception as e:
+        error_msg = f"SMS sending failed: {str(e)}"
+        logger.warning(error_msg)
         return {
             "success": False,
             "error": error_msg,
@@ -1460,86 +2741,197 @@ def send_sms(to_phone: str, message: str) -> Dict:
             "note": "Check Twilio credentials and phone number format"
         }
 
+
+async def send_sms_bulk(messages: List[tuple]) -> List[Dict]:
+    """
+    Send many SMS concurrently over one pooled connection
+
+    Args:
+        messages: List of (to_phone, message) tuples
+
+    Returns:
+        One result dict per message, in the same order
+    """
+    if not TWILIO_ENABLED:
+        return [send_sms(to_phone, message) for to_phone, message in messages]
+
+    async with httpx.AsyncClient(auth=(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN), timeout=10) as client:
+        return await asyncio.gather(
+            *(send_sms_async(client, to_phone, message) for to_phone, message in messages)
+        )
+
+# Notification message templates
+SMS_CASE_STATUS_TEMPLATE = (
+    "Dear {user_name},\n"
+    "Your FairClaim case #{case_id} status has been updated to: {status}.\n"
+    "Visit the portal for details."
+)
+SMS_GRIEVANCE_ACK_TEMPLATE = (
+    "Your grievance #{grievance_id} for case #{case_id} has been registered successfully. "
+    "We will respond within 48 hours."
+)
+
+
+def _case_status_message(case_id: int, new_status: str, user_name: str) -> str:
+    return SMS_CASE_STATUS_TEMPLATE.format_map({
+        "user_name": user_name,
+        "case_id": case_id,
+        "status": new_status.replace("_", " ").title()
+    })
+
+
 def send_case_status_notification(phone: str, case_id: int, new_status: str, user_name: str = "User") -> Dict:
     """Send case status update notification"""
-    status_display = new_status.replace("_", " ").title()
-    message = (
-        f"Dear {user_name},\n"
-        f"Your FairClaim case #{case_id} status has been updated to: {status_display}.\n"
-        f"Visit the portal for details."
-    )
-    return send_sms(phone, message)
+    return send_sms_background(phone, _case_status_message(case_id, new_status, user_name))
+
+
+async def send_case_status_notifications(updates: List[tuple]) -> List[Dict]:
+    """
+    Notify many victims of a status change concurrently
+
+    Args:
+        updates: List of (phone, case_id, new_status, user_name) tuples
+    """
+    results = await send_sms_bulk([
+        (phone, _case_status_message(case_id, new_status, user_name))
+        for phone, case_id, new_status, user_name in updates
+    ])
+    for result in results:
+        if not result.get("success"):
+            logger.warning("Status SMS to %s failed: %s", result.get("to"), result.get("error"))
+    return results
 
 def send_grievance_acknowledgment(phone: str, grievance_id: int, case_id: int) -> Dict:
     """Send grievance submission acknowledgment"""
-    message = (
-        f"Your grievance #{grievance_id} for case #{case_id} has been registered successfully. "
-        f"We will respond within 48 hours."
-    )
-    return send_sms(phone, message)
+    message = SMS_GRIEVANCE_ACK_TEMPLATE.format_map({"grievance_id": grievance_id, "case_id": case_id})
+    return send_sms_background(phone, message)
 
 
 # ==================== DASHBOARD STATISTICS ====================
 
-def get_dashboard_statistics(db: Session, user_role: str = None) -> Dict:
-    """Get aggregated statistics for dashboard"""
-    try:
-        total_cases = db.query(Case).count()
+# The dashboard_stats snapshot table is only ever written by the background refresher
+# (every DASHBOARD_STATS_REFRESH_SECONDS, or within DASHBOARD_STATS_POLL_SECONDS of a write)
+DASHBOARD_STATS_REFRESH_SECONDS = int(os.getenv("DASHBOARD_STATS_REFRESH_SECONDS", "300"))
+DASHBOARD_STATS_POLL_SECONDS = int(os.getenv("DASHBOARD_STATS_POLL_SECONDS", "10"))
+
+# refreshed_at value marking the snapshot stale after a write. It lives in the shared
+# table, so the invalidation reaches every worker process, not just the writer
+_DASHBOARD_DIRTY = datetime(1970, 1, 1)
+
+# Last stats this process served successfully, returned if the database read fails
+_dashboard_last_good: Optional[Dict] = None
 
-        cases_by_status = db.query(
-            Case.status,
-            func.count(Case.id)
-        ).group_by(Case.status).all()
 
-        # Handle status as string (not enum) since it's stored as String in DB
-        status_breakdown = {status: count for status, count in cases_by_status}
+def invalidate_dashboard_cache() -> None:
+    """Mark the dashboard snapshot stale (call after case/grievance writes)"""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(DashboardStats)
+            .where(DashboardStats.id == 1)
+            .values(refreshed_at=_DASHBOARD_DIRTY)
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning("Could not invalidate dashboard snapshot: %s", e)
+    finally:
+        db.close()
 
-        total_allocated = db.query(func.sum(Case.compensation_amount)).scalar() or 0.0
-        total_disbursed = db.query(func.sum(Case.compensation_amount)).filter(
-            Case.status == "COMPLETED"
-        ).scalar() or 0.0
 
-        total_grievances = db.query(Grievance).count()
-        pending_grievances = db.query(Grievance).filter(
-            Grievance.status == "PENDING"
-        ).count()
+def refresh_dashboard_stats_if_due() -> bool:
+    """Rebuild the snapshot if it is missing, invalidated, or older than the refresh interval"""
+    db = SessionLocal()
+    try:
+        row = db.get(DashboardStats, 1)
+        due = (
+            row is None
+            or row.refreshed_at <= _DASHBOARD_DIRTY
+            or (datetime.utcnow() - row.refreshed_at).total_seconds() >= DASHBOARD_STATS_REFRESH_SECONDS
+        )
+    finally:
+        db.close()
+    if due:
+        refresh_dashboard_stats_snapshot()
+    return due
 
-        open_grievances = db.query(Grievance).filter(
-            Grievance.status == "OPEN"
-        ).count()
 
-        in_progress = db.query(Grievance).filter(
-            Grievance.status == "IN_PROGRESS"
-        ).count()
+def refresh_dashboard_stats_snapshot() -> Dict:
+    """Recompute the aggregates and store them in the dashboard_stats table"""
+    db = SessionLocal()
+    try:
+        stats = _compute_dashboard_statistics(db)
+        _store_dashboard_snapshot(db, stats)
+        return stats
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _store_dashboard_snapshot(db: Session, stats: Dict) -> None:
+    """Upsert the single dashboard_stats row"""
+    row = db.get(DashboardStats, 1) or DashboardStats(id=1)
+    grievances = stats["grievances"]
+    row.total_cases = stats["total_cases"]
+    row.status_breakdown = json.dumps(stats["status_breakdown"])
+    row.total_allocated = stats["fund_statistics"]["total_allocated"]
+    row.total_disbursed = stats["fund_statistics"]["total_disbursed"]
+    row.grievances_total = grievances["total"]
+    row.grievances_pending = grievances["pending"]
+    row.grievances_open = grievances["open"]
+    row.grievances_in_progress = grievances["in_progress"]
+    row.grievances_resolved = grievances["resolved"]
+    row.grievances_high_priority = grievances["high_priority"]
+    row.refreshed_at = datetime.utcnow()
+    db.merge(row)
+    db.commit()
 
-        resolved = db.query(Grievance).filter(
-            Grievance.status == "RESOLVED"
-        ).count()
 
-        high_priority = db.query(Grievance).filter(
-            Grievance.priority == "HIGH"
-        ).count()
+def _load_dashboard_snapshot(db: Session) -> Optional[Dict]:
+    """Stats from the snapshot row, or None if it is missing, stale, or predates a write"""
+    row = db.get(DashboardStats, 1)
+    if row is None or row.refreshed_at <= _DASHBOARD_DIRTY:
+        return None
+    if (datetime.utcnow() - row.refreshed_at).total_seconds() > 2 * DASHBOARD_STATS_REFRESH_SECONDS:
+        return None
 
-        return {
-            "total_cases": total_cases,
-            "status_breakdown": status_breakdown,
-            "fund_statistics": {
-                "total_allocated": round(total_allocated, 2),
-                "total_disbursed": round(total_disbursed, 2),
-                "pending": round(total_allocated - total_disbursed, 2)
-            },
-            "grievances": {
-                "total": total_grievances,
-                "pending": pending_grievances,
-                "open": open_grievances,
-                "in_progress": in_progress,
-                "resolved": resolved,
-                "high_priority": high_priority
-            }
+    return {
+        "total_cases": row.total_cases,
+        "status_breakdown": json.loads(row.status_breakdown),
+        "fund_statistics": {
+            "total_allocated": round(row.total_allocated, 2),
+            "total_disbursed": round(row.total_disbursed, 2),
+            "pending": round(row.total_allocated - row.total_disbursed, 2)
+        },
+        "grievances": {
+            "total": row.grievances_total,
+            "pending": row.grievances_pending,
+            "open": row.grievances_open,
+            "in_progress": row.grievances_in_progress,
+            "resolved": row.grievances_resolved,
+            "high_priority": row.grievances_high_priority
         }
+    }
 
+
+def get_dashboard_statistics(db: Session, user_role: str = None) -> Dict:
+    """
+    Get aggregated statistics for dashboard
+    Read-only: the snapshot row when it is fresh, otherwise a live computation
+    (the background refresher owns all snapshot writes)
+    """
+    global _dashboard_last_good
+    try:
+        stats = _load_dashboard_snapshot(db)
+        if stats is None:
+            stats = _compute_dashboard_statistics(db)
     except Exception as e:
-        print(f"❌ Error fetching dashboard stats: {str(e)}")
+        db.rollback()  # Leave the request's session usable
+        logger.warning("Error fetching dashboard stats: %s", e)
+        if _dashboard_last_good is not None:
+            return copy.deepcopy(_dashboard_last_good)
         return {
             "total_cases": 0,
             "status_breakdown": {},
@@ -1558,8 +2950,71 @@ def get_dashboard_statistics(db: Session, user_role: str = None) -> Dict:
             }
         }
 
+    _dashboard_last_good = copy.deepcopy(stats)
+    return stats
+
+
+# Dashboard statements are built once so SQLAlchemy's compiled cache always hits
+_STMT_CASE_TOTALS = select(
+    func.count(Case.id),
+    func.sum(Case.compensation_amount),
+    func.sum(case((Case.status == "COMPLETED", Case.compensation_amount)))
+)
+_STMT_CASE_STATUS_BREAKDOWN = select(Case.status, func.count(Case.id)).group_by(Case.status)
+_STMT_GRIEVANCE_COUNTS = select(
+    func.count(Grievance.id).label("total"),
+    func.count(case((Grievance.status == "PENDING", 1))).label("pending"),
+    func.count(case((Grievance.status == "OPEN", 1))).label("open"),
+    func.count(case((Grievance.status == "IN_PROGRESS", 1))).label("in_progress"),
+    func.count(case((Grievance.status == "RESOLVED", 1))).label("resolved"),
+    func.count(case((Grievance.priority == "HIGH", 1))).label("high_priority")
+)
+
+
+def _compute_dashboard_statistics(db: Session) -> Dict:
+    """Run the aggregate queries behind get_dashboard_statistics"""
+    # Case totals and fund sums in one pass
+    total_cases, total_allocated, total_disbursed = db.execute(_STMT_CASE_TOTALS).one()
+    total_allocated = total_allocated or 0.0
+    total_disbursed = total_disbursed or 0.0
+
+    # Handle status as string (not enum) since it's stored as String in DB
+    status_breakdown = {status: count for status, count in db.execute(_STMT_CASE_STATUS_BREAKDOWN)}
+
+    # All grievance counters via conditional aggregation (single scan)
+    g = db.execute(_STMT_GRIEVANCE_COUNTS).one()
+
+    return {
+        "total_cases": total_cases,
+        "status_breakdown": status_breakdown,
+        "fund_statistics": {
+            "total_allocated": round(total_allocated, 2),
+            "total_disbursed": round(total_disbursed, 2),
+            "pending": round(total_allocated - total_disbursed, 2)
+        },
+        "grievances": {
+            "total": g.total,
+            "pending": g.pending,
+            "open": g.open,
+            "in_progress": g.in_progress,
+            "resolved": g.resolved,
+            "high_priority": g.high_priority
+        }
+    }
+
 # ==================== COMPENSATION CALCULATOR ====================
 
+# (act, stage) -> compensation amount, see calculate_compensation
+COMPENSATION_MATRIX = {
+    ("PCR Act 1955", "FIR"): 50000.0,
+    ("PCR Act 1955", "CHARGESHEET"): 100000.0,
+    ("PCR Act 1955", "CONVICTION"): 200000.0,
+    ("PoA Act 2015", "FIR"): 75000.0,
+    ("PoA Act 2015", "CHARGESHEET"): 150000.0,
+    ("PoA Act 2015", "CONVICTION"): 250000.0,
+}
+
+
 def calculate_compensation(act_type: str, stage: str = "FIR") -> float:
     """
     Auto-calculate compensation based on PCR/PoA Act and case stage.
@@ -1576,21 +3031,7 @@ def calculate_compensation(act_type: str, stage: str = "FIR") -> float:
     - Chargesheet Stage: ₹1,50,000
     - Conviction Stage: ₹2,50,000
     """
-    
-    compensation_matrix = {
-        "PCR Act 1955": {
-            "FIR": 50000.0,
-            "CHARGESHEET": 100000.0,
-            "CONVICTION": 200000.0
-        },
-        "PoA Act 2015": {
-            "FIR": 75000.0,
-            "CHARGESHEET": 150000.0,
-            "CONVICTION": 250000.0
-        }
-    }
-    
-    return compensation_matrix.get(act_type, {}).get(stage.upper(), 50000.0)
+    return COMPENSATION_MATRIX.get((act_type, stage.upper()), 50000.0)
 
 # ==================== PLACEHOLDER FOR DEV B SERVICES ====================
 
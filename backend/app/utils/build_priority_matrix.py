@@ -0,0 +1,17 @@
+"""
+Build the priority embedding matrix loaded by the NLP classifier.
+Re-run whenever the priority templates or the model change.
+"""
+
+from app.services.priority_classifier import NLPPriorityClassifier, PRIORITY_MATRIX_PATH
+
+
+def build_priority_matrix():
+    """Encode the priority templates and save them to PRIORITY_MATRIX_PATH"""
+    classifier = NLPPriorityClassifier()
+    classifier.save_priority_matrix()
+    print(f"✅ Priority matrix written to {PRIORITY_MATRIX_PATH}")
+
+
+if __name__ == "__main__":
+    build_priority_matrix()
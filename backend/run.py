@@ -3,6 +3,7 @@ Application Startup Script
 Quick way to run the FastAPI application with uvicorn
 """
 import uvicorn
+import importlib.util
 import os
 
 if __name__ == "__main__":
@@ -10,22 +11,54 @@ if __name__ == "__main__":
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", 8000))
     RELOAD = os.getenv("RELOAD", "True").lower() == "true"
+    PROD = os.getenv("ENV") == "prod"
+    WORKERS = int(os.getenv("WORKERS", os.cpu_count() or 1))
+    if PROD:
+        # Worker processes read this to size their per-process OCR pools
+        os.environ["WORKERS"] = str(WORKERS)
     
     print("=" * 60)
     print("🚀 Starting FairClaim Backend Server")
     print("=" * 60)
     print(f"🌐 Host: {HOST}")
     print(f"🔌 Port: {PORT}")
-    print(f"🔄 Auto-reload: {RELOAD}")
+    if PROD:
+        print(f"🏭 Production: {WORKERS} workers")
+    else:
+        print(f"🔄 Auto-reload: {RELOAD}")
     print(f"📚 API Docs: http://localhost:{PORT}/docs")
     print(f"📖 ReDoc: http://localhost:{PORT}/redoc")
     print("=" * 60)
     
-    uvicorn.run(
-        "app.main:app",
-        host=HOST,
-        port=PORT,
-        reload=RELOAD,
-        log_level="info",
-        access_log=True
-    )
+    if PROD:
+        # Create tables and seed once here, before the workers start; each worker
+        # then sees FAIRCLAIM_DB_READY and skips the import-time reseed in app.main
+        from app.utils.seed_data import seed_all
+        if os.getenv("SEED_ON_STARTUP", "1") == "1":
+            seed_all(fresh=True)
+        else:
+            from app.database import init_db
+            init_db()
+        os.environ["FAIRCLAIM_DB_READY"] = "1"
+        
+        # Multi-process, libuv event loop, C HTTP parser; access logging off (per-request formatting cost).
+        # uvloop isn't installed on Windows (see requirements.txt), so fall back to asyncio there
+        uvicorn.run(
+            "app.main:app",
+            host=HOST,
+            port=PORT,
+            workers=WORKERS,
+            loop="uvloop" if importlib.util.find_spec("uvloop") else "auto",
+            http="httptools" if importlib.util.find_spec("httptools") else "auto",
+            log_level="warning",
+            access_log=False
+        )
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host=HOST,
+            port=PORT,
+            reload=RELOAD,
+            log_level="info",
+            access_log=True
+        )
@@ -1,75 +1,121 @@
-from app.services.priority_classifier import NLPPriorityClassifier
+import os
+import sys
+from collections import namedtuple
+import numpy as np
+import pytest
+from app.services.priority_classifier import get_nlp_classifier
+
+# Immutable test case record (not named Test* so pytest doesn't try to collect it)
+ClassifierCase = namedtuple("ClassifierCase", ["title", "description", "category", "expected"])
+
+# Test cases with different priorities
+TEST_CASES = (
+    ClassifierCase(
+        "Victim receiving death threats from accused party",
+        "The victim and family are receiving continuous death threats. The accused has threatened to kill them. Immediate police protection is urgently needed as they fear for their lives.",
+        "life threat",
+        "CRITICAL"
+    ),
+    ClassifierCase(
+        "Urgent medical treatment needed",
+        "Victim has severe injuries from the assault and requires immediate hospitalization. Medical emergency situation.",
+        "medical emergency",
+        "HIGH"
+    ),
+    ClassifierCase(
+        "Compensation payment delayed",
+        "The compensation amount has not been credited to my bank account even after 60 days of case approval. Need to check status.",
+        "payment delay",
+        "MEDIUM"
+    ),
+    ClassifierCase(
+        "Question about case status",
+        "I want to know the current status of my case and when I can expect an update.",
+        "general inquiry",
+        "LOW"
+    ),
+    ClassifierCase(
+        "Violence and assault by upper caste members",
+        "I was physically assaulted and beaten. Need urgent police action against the perpetrators.",
+        "physical assault",
+        "HIGH"
+    ),
+    ClassifierCase(
+        "Document verification pending",
+        "My caste certificate is still under verification for the past 3 weeks. Please expedite.",
+        "verification issue",
+        "MEDIUM"
+    )
+)
+
+# Struct-of-arrays view: parallel tuples that feed the batch API directly
+TITLES, DESCRIPTIONS, CATEGORIES, EXPECTED = zip(*TEST_CASES)
+
+PRIORITY_CODES = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+EXPECTED_CODES = np.fromiter((PRIORITY_CODES[e] for e in EXPECTED), dtype=np.int8, count=len(EXPECTED))
+
+# Per-case report block
+RESULT_TEMPLATE = (
+    "\nTest {i}: {mark}\n"
+    "Title: {title}\n"
+    "Expected: {expected} | Got: {priority}\n"
+    "Confidence: {confidence}\n"
+    "Explanation: {explanation}\n"
+    + "-"*70
+)
+
 
 def test_nlp_classifier():
     print("\n🤖 Testing NLP-Based Priority Classifier\n")
     print("="*70)
     
-    classifier = NLPPriorityClassifier()
+    # Shared process-wide instance: the model and template embeddings load once
+    classifier = get_nlp_classifier()
     
-
-    # Test cases with different priorities
-    test_cases = [
-        {
-            "title": "Victim receiving death threats from accused party",
-            "description": "The victim and family are receiving continuous death threats. The accused has threatened to kill them. Immediate police protection is urgently needed as they fear for their lives.",
-            "category": "life threat",
-            "expected": "CRITICAL"
-        },
-        {
-            "title": "Urgent medical treatment needed",
-            "description": "Victim has severe injuries from the assault and requires immediate hospitalization. Medical emergency situation.",
-            "category": "medical emergency",
-            "expected": "HIGH"
-        },
-        {
-            "title": "Compensation payment delayed",
-            "description": "The compensation amount has not been credited to my bank account even after 60 days of case approval. Need to check status.",
-            "category": "payment delay",
-            "expected": "MEDIUM"
-        },
-        {
-            "title": "Question about case status",
-            "description": "I want to know the current status of my case and when I can expect an update.",
-            "category": "general inquiry",
-            "expected": "LOW"
-        },
-        {
-            "title": "Violence and assault by upper caste members",
-            "description": "I was physically assaulted and beaten. Need urgent police action against the perpetrators.",
-            "category": "physical assault",
-            "expected": "HIGH"
-        },
-        {
-            "title": "Document verification pending",
-            "description": "My caste certificate is still under verification for the past 3 weeks. Please expedite.",
-            "category": "verification issue",
-            "expected": "MEDIUM"
-        }
-    ]
+    # Warm the batched encode path so first-call setup stays out of the measured run
+    classifier.classify_with_confidence_batch(["warmup"], ["warmup text long enough to be encoded"], [""])
     
-    correct = 0
+    # Classify every case in one batched encode, then just report
+    results = classifier.classify_with_confidence_batch(TITLES, DESCRIPTIONS, CATEGORIES)
     
-    for i, test in enumerate(test_cases, 1):
-        result = classifier.classify_with_confidence(
-            test['title'],
-            test['description'],
-            test['category']
-        )
-        
-        is_correct = result['priority'] == test['expected']
-        if is_correct:
-            correct += 1
-        
-        print(f"\nTest {i}: {'✅' if is_correct else '❌'}")
-        print(f"Title: {test['title']}")
-        print(f"Expected: {test['expected']} | Got: {result['priority']}")
-        print(f"Confidence: {result['confidence']}")
-        print(f"Explanation: {result['explanation']}")
-        print("-"*70)
+    # Score all cases in one vectorized comparison
+    got_codes = np.fromiter((PRIORITY_CODES[r['priority']] for r in results), dtype=np.int8, count=len(results))
+    hits = got_codes == EXPECTED_CODES
+    correct = int(hits.sum())
     
-    accuracy = (correct / len(test_cases)) * 100
-    print(f"\n📊 Accuracy: {accuracy:.1f}% ({correct}/{len(test_cases)} correct)")
-    print("="*70 + "\n")
+    # Buffer the report and write it once
+    out = []
+    for i, (title, expected, result, is_correct) in enumerate(zip(TITLES, EXPECTED, results, hits.tolist()), 1):
+        out.append(RESULT_TEMPLATE.format(
+            i=i,
+            mark='✅' if is_correct else '❌',
+            title=title,
+            expected=expected,
+            priority=result['priority'],
+            confidence=result['confidence'],
+            explanation=result['explanation']
+        ))
+    
+    accuracy = hits.mean() * 100
+    out.append(f"\n📊 Accuracy: {accuracy:.1f}% ({correct}/{len(TEST_CASES)} correct)")
+    out.append("="*70 + "\n")
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+# Quantized embeddings can move borderline semantic cases across a priority
+# boundary; the expected labels are pinned to the default float32 torch build
+APPROXIMATE_BUILD = os.getenv("NLP_QUANTIZE") == "1"
+
+
+# One independent test per case, so `pytest -n auto` can spread them across
+# workers (each worker loads the singleton classifier once)
+@pytest.mark.parametrize("title,description,category,expected", TEST_CASES)
+def test_nlp_case(title, description, category, expected):
+    if APPROXIMATE_BUILD and expected != "CRITICAL":
+        pytest.skip("expected priorities are pinned to the unquantized model")
+    result = get_nlp_classifier().classify_with_confidence(title, description, category)
+    assert result['priority'] == expected, f"{title!r}: expected {expected}, got {result['priority']}"
+
 
 if __name__ == "__main__":
     test_nlp_classifier()